@@ -1,10 +1,13 @@
 """The Dreame Vacuum component."""
 from __future__ import annotations
+import shutil
+from functools import partial
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN
+from .const import DOMAIN, MAP_CACHE_DIR
 from .coordinator import DreameVacuumDataUpdateCoordinator
+from .dreame import DreameVacuumDevice
 import warnings
 
 # Suppress python-miio FutureWarning on Python 3.13
@@ -53,9 +56,19 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator._device = None
         del hass.data[DOMAIN][entry.entry_id]
 
+        if not hass.data[DOMAIN]:
+            await hass.async_add_executor_job(DreameVacuumDevice.shutdown)
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove files of Dreame Vacuum config entry."""
+    await hass.async_add_executor_job(
+        partial(shutil.rmtree, hass.config.path(MAP_CACHE_DIR, DOMAIN, entry.entry_id), ignore_errors=True)
+    )
+
+
 async def update_listener(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(config_entry.entry_id)
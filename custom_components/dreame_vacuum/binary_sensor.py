@@ -15,6 +15,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
+from .dreame import DOCKED_PROPERTIES
 
 from .coordinator import DreameVacuumDataUpdateCoordinator
 from .entity import DreameVacuumEntity, DreameVacuumEntityDescription
@@ -30,6 +31,7 @@ BINARY_SENSORS: tuple[BinarySensorEntityDescription, ...] = (
     DreameVacuumBinarySensorEntityDescription(
         key="charging_state",
         name="Charging State",
+        property_keys=DOCKED_PROPERTIES,
         device_class=BinarySensorDeviceClass.BATTERY_CHARGING,
         icon_fn=lambda value, device: (
             "mdi:power-plug-battery"
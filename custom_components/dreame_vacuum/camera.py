@@ -22,8 +22,8 @@ from .const import (
     CONF_COLOR_SCHEME,
     CONF_ICON_SET,
     CONF_HIDDEN_MAP_OBJECTS,
+    CONF_IMAGE_FORMAT,
     ATTR_CALIBRATION,
-    CONTENT_TYPE,
     LOGGER,
 )
 
@@ -61,14 +61,22 @@ async def async_setup_entry(
     color_scheme = entry.options.get(CONF_COLOR_SCHEME)
     icon_set = entry.options.get(CONF_ICON_SET)
     hidden_map_objects = entry.options.get(CONF_HIDDEN_MAP_OBJECTS, [])
+    image_format = entry.options.get(CONF_IMAGE_FORMAT)
     if coordinator.device.status.map_available:
         async_add_entities(
-            DreameVacuumCameraEntity(coordinator, description, color_scheme, icon_set, hidden_map_objects)
+            DreameVacuumCameraEntity(coordinator, description, color_scheme, icon_set, hidden_map_objects, image_format)
             for description in CAMERAS
         )
 
     update_map_cameras = partial(
-        async_update_map_cameras, coordinator, {}, async_add_entities, color_scheme, icon_set, hidden_map_objects
+        async_update_map_cameras,
+        coordinator,
+        {},
+        async_add_entities,
+        color_scheme,
+        icon_set,
+        hidden_map_objects,
+        image_format,
     )
     coordinator.async_add_listener(update_map_cameras)
     update_map_cameras()
@@ -82,6 +90,7 @@ def async_update_map_cameras(
     color_scheme: str,
     icon_set: str,
     hidden_map_objects: list[str],
+    image_format: str,
 ) -> None:
     new_indexes = set([k for k in range(1, len(coordinator.device.status.map_list) + 1)])
     current_ids = set(current)
@@ -101,6 +110,7 @@ def async_update_map_cameras(
                 color_scheme,
                 icon_set,
                 hidden_map_objects,
+                image_format,
                 map_index,
             )
         ]
@@ -138,11 +148,11 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
         color_scheme: str = None,
         icon_set: str = None,
         hidden_map_objects: list[str] = None,
+        image_format: str = None,
         map_index: int = 0,
     ) -> None:
         """Initialize a Dreame Vacuum Camera entity."""
         super().__init__(coordinator, description)
-        self.content_type = CONTENT_TYPE
         self.stream = None
         self.access_tokens = collections.deque([], 2)
         self.async_update_token()
@@ -159,8 +169,9 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             self._renderer = DreameVacuumMapDataRenderer()
         else:
             self._renderer = DreameVacuumMapRenderer(
-                color_scheme, icon_set, hidden_map_objects, self.device.status.robot_shape
+                color_scheme, icon_set, hidden_map_objects, self.device.status.robot_shape, image_format
             )
+        self.content_type = self._renderer.content_type
 
         self._image = self._renderer.default_map_image
         self._default_map = True
@@ -285,7 +296,7 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
                     self._state = datetime.fromtimestamp(int(map_data.last_updated))
 
                 self.coordinator.hass.async_create_task(
-                    self._update_image(self.device.get_map_for_render(self.map_index), self.device.status.robot_status)
+                    self._update_image(self._last_updated, self.device.status.robot_status)
                 )
         elif not self._default_map:
             self._image = self._default_map_image
@@ -294,7 +305,13 @@ class DreameVacuumCameraEntity(DreameVacuumEntity, Camera):
             self._last_updated = -1
             self._state = STATE_UNAVAILABLE
 
-    async def _update_image(self, map_data, robot_status) -> None:
+    async def _update_image(self, last_updated, robot_status) -> None:
+        # Map optimization may wait for its time budget so it must not block the event loop
+        map_data = await self.coordinator.hass.async_add_executor_job(self.device.get_map_for_render, self.map_index)
+        if last_updated != self._last_updated:
+            # A newer frame is requested while this one was being prepared
+            return
+
         self._image = self._renderer.render_map(map_data, robot_status)
         if not self.entity_description.map_data_json and self._calibration_points != self._renderer.calibration_points:
             self._calibration_points = self._renderer.calibration_points
@@ -22,7 +22,7 @@ from homeassistant.config_entries import (
     OptionsFlow,
 )
 
-from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST, VERSION
+from .dreame import DreameVacuumProtocol, MAP_COLOR_SCHEME_LIST, MAP_ICON_SET_LIST, MAP_IMAGE_FORMAT_LIST, VERSION
 
 from .const import (
     DOMAIN,
@@ -36,6 +36,11 @@ from .const import (
     CONF_DID,
     CONF_AUTH_KEY,
     CONF_HIDDEN_MAP_OBJECTS,
+    CONF_IMAGE_FORMAT,
+    CONF_PARALLEL_MAP_DECODING,
+    CONF_MAP_CACHE,
+    CONF_MAP_OPTIMIZER_POOL_SIZE,
+    CONF_MAP_OPTIMIZATION_TIMEOUT,
     CONF_PREFER_CLOUD,
     CONF_DONATED,
     CONF_VERSION,
@@ -155,6 +160,26 @@ class DreameVacuumOptionsFlowHandler(OptionsFlow):
                         CONF_HIDDEN_MAP_OBJECTS,
                         default=self._config_entry.options.get(CONF_HIDDEN_MAP_OBJECTS, []),
                     ): cv.multi_select(MAP_OBJECTS),
+                    vol.Required(
+                        CONF_IMAGE_FORMAT,
+                        default=self._config_entry.options.get(CONF_IMAGE_FORMAT, next(iter(MAP_IMAGE_FORMAT_LIST))),
+                    ): vol.In(list(MAP_IMAGE_FORMAT_LIST.keys())),
+                    vol.Required(
+                        CONF_PARALLEL_MAP_DECODING,
+                        default=self._config_entry.options.get(CONF_PARALLEL_MAP_DECODING, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAP_CACHE,
+                        default=self._config_entry.options.get(CONF_MAP_CACHE, False),
+                    ): bool,
+                    vol.Required(
+                        CONF_MAP_OPTIMIZER_POOL_SIZE,
+                        default=self._config_entry.options.get(CONF_MAP_OPTIMIZER_POOL_SIZE, 2),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=4)),
+                    vol.Required(
+                        CONF_MAP_OPTIMIZATION_TIMEOUT,
+                        default=self._config_entry.options.get(CONF_MAP_OPTIMIZATION_TIMEOUT, 2),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
                 }
             )
             if self._config_entry.data.get(CONF_ACCOUNT_TYPE, ACCOUNT_TYPE_MI) == ACCOUNT_TYPE_MI:
@@ -517,6 +542,7 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                 CONF_COLOR_SCHEME: user_input.get(CONF_COLOR_SCHEME),
                 CONF_ICON_SET: user_input.get(CONF_ICON_SET),
                 CONF_HIDDEN_MAP_OBJECTS: user_input.get(CONF_HIDDEN_MAP_OBJECTS),
+                CONF_IMAGE_FORMAT: user_input.get(CONF_IMAGE_FORMAT),
                 CONF_PREFER_CLOUD: self.prefer_cloud,
             }
 
@@ -550,6 +576,9 @@ class DreameVacuumFlowHandler(ConfigFlow, domain=DOMAIN):
                     ),
                     vol.Required(CONF_ICON_SET, default=default_icon_set): vol.In(list(MAP_ICON_SET_LIST.keys())),
                     vol.Required(CONF_HIDDEN_MAP_OBJECTS, default=hidden_map_objects): cv.multi_select(MAP_OBJECTS),
+                    vol.Required(CONF_IMAGE_FORMAT, default=next(iter(MAP_IMAGE_FORMAT_LIST))): vol.In(
+                        list(MAP_IMAGE_FORMAT_LIST.keys())
+                    ),
                 }
             )
 
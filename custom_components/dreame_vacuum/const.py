@@ -24,6 +24,11 @@ CONF_DID: Final = "did"
 CONF_AUTH_KEY: Final = "auth_key"
 CONF_MAP_OBJECTS: Final = "map_objects"
 CONF_HIDDEN_MAP_OBJECTS: Final = "hidden_map_objects"
+CONF_IMAGE_FORMAT: Final = "image_format"
+CONF_PARALLEL_MAP_DECODING: Final = "parallel_map_decoding"
+CONF_MAP_CACHE: Final = "map_cache"
+CONF_MAP_OPTIMIZER_POOL_SIZE: Final = "map_optimizer_pool_size"
+CONF_MAP_OPTIMIZATION_TIMEOUT: Final = "map_optimization_timeout"
 CONF_PREFER_CLOUD: Final = "prefer_cloud"
 CONF_ACCOUNT_TYPE: Final = "account_type"
 CONF_DONATED: Final = "donated"
@@ -31,6 +36,8 @@ CONF_VERSION: Final = "version"
 
 CONTENT_TYPE: Final = "image/png"
 
+MAP_CACHE_DIR: Final = ".cache"
+
 MAP_OBJECTS: Final = {
     "color": "Room Colors",
     "icon": "Room Icons",
@@ -24,11 +24,16 @@ from .const import (
     CONF_DID,
     CONF_AUTH_KEY,
     CONF_PREFER_CLOUD,
+    CONF_PARALLEL_MAP_DECODING,
+    CONF_MAP_CACHE,
+    CONF_MAP_OPTIMIZER_POOL_SIZE,
+    CONF_MAP_OPTIMIZATION_TIMEOUT,
     CONF_MAP_OBJECTS,
     CONF_HIDDEN_MAP_OBJECTS,
     CONF_DONATED,
     CONF_VERSION,
     MAP_OBJECTS,
+    MAP_CACHE_DIR,
     CONTENT_TYPE,
     NOTIFICATION_CLEANUP_COMPLETED,
     NOTIFICATION_MAIN_BRUSH_NO_LIFE_LEFT,
@@ -95,6 +100,8 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
         self._available = False
         self._has_warning = False
         self._has_temporary_map = None
+        self._device_connected = None
+        self._changed_properties = None
 
         LOGGER.info("Integration loading: %s", entry.data[CONF_NAME])
 
@@ -130,6 +137,10 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
             entry.options.get(CONF_PREFER_CLOUD, True),
             entry.data.get(CONF_DID),
             self._auth_key,
+            hass.config.path(MAP_CACHE_DIR, DOMAIN, entry.entry_id) if entry.options.get(CONF_MAP_CACHE) else None,
+            entry.options.get(CONF_PARALLEL_MAP_DECODING, False),
+            entry.options.get(CONF_MAP_OPTIMIZER_POOL_SIZE),
+            entry.options.get(CONF_MAP_OPTIMIZATION_TIMEOUT),
         )
 
         self.device.listen(self._dust_collection_changed, DreameVacuumProperty.DUST_COLLECTION)
@@ -345,11 +356,11 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
     def set_update_error(self, ex=None) -> None:
         self.hass.loop.call_soon_threadsafe(self.async_set_update_error, ex)
 
-    def set_updated_data(self, device=None) -> None:
-        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, device)
+    def set_updated_data(self, changed_properties=None) -> None:
+        self.hass.loop.call_soon_threadsafe(self.async_set_updated_data, None, changed_properties)
 
     @callback
-    def async_set_updated_data(self, device=None) -> None:
+    def async_set_updated_data(self, device=None, changed_properties=None) -> None:
         if self._has_temporary_map != self.device.status.has_temporary_map:
             self._has_temporary_map_changed(self._has_temporary_map)
             self._has_temporary_map = self.device.status.has_temporary_map
@@ -376,9 +387,30 @@ class DreameVacuumDataUpdateCoordinator(DataUpdateCoordinator[DreameVacuumDevice
             self.hass.config_entries.async_schedule_reload(self._entry.entry_id)
             return
 
-        self._available = self.device.available
+        # Entities are only notified about the changed properties when the device availability is not changed
+        available = self.device.available
+        device_connected = self.device.device_connected
+        if available != self._available or device_connected != self._device_connected:
+            changed_properties = None
 
-        super().async_set_updated_data(self.device)
+        self._available = available
+        self._device_connected = device_connected
+        self._changed_properties = changed_properties
+        try:
+            super().async_set_updated_data(self.device)
+        finally:
+            self._changed_properties = None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners or only the ones subscribed to the changed properties."""
+        if self._changed_properties is None:
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or not context.isdisjoint(self._changed_properties):
+                update_callback()
 
     @callback
     def async_set_update_error(self, ex) -> None:
@@ -17,8 +17,13 @@ from .types import (
     DreameVacuumMoppingType,
     PROPERTY_AVAILABILITY,
     ACTION_AVAILABILITY,
+    CHARGING_PROPERTIES,
+    DOCKED_PROPERTIES,
+    FAST_MAPPING_PROPERTIES,
+    STATE_PROPERTIES,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_IMAGE_FORMAT_LIST,
 )
 from .const import (
     SUCTION_LEVEL_CODE_TO_NAME,
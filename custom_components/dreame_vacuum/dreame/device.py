@@ -6,9 +6,11 @@ import re
 import copy
 import zlib
 import base64
+from concurrent.futures import Future
 from datetime import datetime
+from functools import wraps
 from random import randrange
-from threading import Timer
+from threading import Timer, Lock
 from typing import Any, Optional
 
 from .types import (
@@ -36,6 +38,7 @@ from .types import (
     DreameVacuumSelfCleanArea,
     DreameVacuumMopWashLevel,
     DreameVacuumMoppingType,
+    DreameVacuumPropertyStore,
     CleaningHistory,
     MapData,
     Segment,
@@ -116,6 +119,11 @@ class DreameVacuumDevice:
     property_mapping: dict[DreameVacuumProperty, dict[str, int]] = DreameVacuumPropertyMapping
     action_mapping: dict[DreameVacuumAction, dict[str, int]] = DreameVacuumActionMapping
 
+    # Changes within this period in seconds are notified to the external listener together
+    PROPERTY_CHANGE_DELAY = 0.1
+    # Property writes within this period in seconds are sent to the device with a single request
+    PROPERTY_WRITE_DELAY = 0.2
+
     def __init__(
         self,
         name: str,
@@ -128,6 +136,10 @@ class DreameVacuumDevice:
         prefer_cloud: bool = False,
         device_id: str = None,
         auth_key: str = None,
+        map_cache_path: str = None,
+        parallel_map_decoding: bool = False,
+        map_optimizer_pool_size: int = None,
+        map_optimization_timeout: float = None,
     ) -> None:
         # Used for tracking the task status is changed from cleaning to completed
         self.cleanup_completed: bool = False
@@ -135,8 +147,8 @@ class DreameVacuumDevice:
         self.mac: str = None
         self.token: str = None  # Local api token
         self.host: str = None  # IP address or host name of the device
-        # Dictionary for storing the current property values
-        self.data: dict[DreameVacuumProperty, Any] = {}
+        # Store for the current property values and their changes
+        self.data: DreameVacuumPropertyStore = DreameVacuumPropertyStore()
         self.available: bool = False  # Last update is successful or not
         self.disconnected: bool = False
 
@@ -160,6 +172,13 @@ class DreameVacuumDevice:
         # External update callbacks for specific device property
         self._property_update_callback = {}
         self._update_timer: Timer = None  # Update schedule timer
+        self._notify_timer: Timer = None  # Pending external listener notification timer
+        self._notify_lock: Lock = Lock()
+        self._notified_version: int = 0  # Property store version at the last external listener notification
+        # Property writes waiting to be sent as [value, value before the first write, futures of the writes]
+        self._pending_writes: dict[DreameVacuumProperty, list] = {}
+        self._write_timer: Timer = None  # Pending property writes flush timer
+        self._write_lock: Lock = Lock()
         # Used for requesting consumable properties after reset action otherwise they will only requested when cleaning completed
         self._consumable_reset: bool = False
         self._remote_control: bool = False
@@ -185,7 +204,13 @@ class DreameVacuumDevice:
             self.host, self.token, username, password, country, prefer_cloud, device_id, auth_key
         )
         if self._protocol.cloud:
-            self._map_manager = DreameMapVacuumMapManager(self._protocol)
+            self._map_manager = DreameMapVacuumMapManager(
+                self._protocol,
+                map_cache_path,
+                parallel_map_decoding,
+                map_optimizer_pool_size,
+                map_optimization_timeout,
+            )
 
             self.listen(self._map_list_changed, DreameVacuumProperty.MAP_LIST)
             self.listen(self._recovery_map_list_changed, DreameVacuumProperty.RECOVERY_MAP_LIST)
@@ -254,8 +279,7 @@ class DreameVacuumDevice:
                 results.extend(result)
                 props[:] = props[15:]
 
-        changed = False
-        callbacks = []
+        changed_properties = {}
         for prop in results:
             if prop["code"] == 0 and "value" in prop:
                 did = int(prop["did"])
@@ -272,24 +296,24 @@ class DreameVacuumDevice:
                     del self._dirty_data[did]
                     continue
 
-                if self.data.get(did, None) != value:
-                    # Do not call external listener when map list and recovery map list properties changed
-                    if (
-                        did != DreameVacuumProperty.MAP_LIST.value
-                        and did != DreameVacuumProperty.RECOVERY_MAP_LIST.value
-                    ):
-                        changed = True
-                    current_value = self.data.get(did)
-                    if current_value is not None:
-                        _LOGGER.info(
-                            "Property %s Changed: %s -> %s", DreameVacuumProperty(did).name, current_value, value
-                        )
-                    else:
-                        _LOGGER.info("Property %s Added: %s", DreameVacuumProperty(did).name, value)
-                    self.data[did] = value
-                    if did in self._property_update_callback:
-                        for callback in self._property_update_callback[did]:
-                            callbacks.append([callback, current_value])
+                # Store only records the values that are changed, properties written from other threads meanwhile are
+                # handled by their writers
+                if self.data.set(did, value):
+                    changed_properties[did] = (self.data.previous(did), value)
+
+        changed = False
+        callbacks = []
+        for did, (current_value, value) in changed_properties.items():
+            # Do not call external listener when map list and recovery map list properties changed
+            if did != DreameVacuumProperty.MAP_LIST.value and did != DreameVacuumProperty.RECOVERY_MAP_LIST.value:
+                changed = True
+            if current_value is not None:
+                _LOGGER.info("Property %s Changed: %s -> %s", DreameVacuumProperty(did).name, current_value, value)
+            else:
+                _LOGGER.info("Property %s Added: %s", DreameVacuumProperty(did).name, value)
+            if did in self._property_update_callback:
+                for callback in self._property_update_callback[did]:
+                    callbacks.append([callback, current_value])
 
         if not self._ready:
             self.status.update_static_properties()
@@ -668,11 +692,32 @@ class DreameVacuumDevice:
             except:
                 _LOGGER.warning("Get Cleaning History failed!")
 
-    def _property_changed(self) -> None:
-        """Call external listener when a property changed"""
+    def _property_changed(self, immediate: bool = False) -> None:
+        """Call external listener when a property changed, consecutive changes are batched into a single call"""
+        self.status.invalidate_cache()
+        with self._notify_lock:
+            if not immediate:
+                if self._notify_timer is None and self._update_callback:
+                    self._notify_timer = Timer(self.PROPERTY_CHANGE_DELAY, self._notify_property_changes)
+                    self._notify_timer.start()
+                return
+
+            if self._notify_timer:
+                self._notify_timer.cancel()
+        self._notify_property_changes()
+
+    def _notify_property_changes(self) -> None:
+        """Call external listener with the ids of the properties changed since the last call"""
+        with self._notify_lock:
+            self._notify_timer = None
+            version = self.data.version
+            changed_properties = set(self.data.changes_since(self._notified_version))
+            self._notified_version = version
+
         if self._update_callback:
-            _LOGGER.debug("Update Callback")
-            self._update_callback()
+            _LOGGER.debug("Update Callback: %s", changed_properties)
+            # Listener is notified with None when nothing but a non property value is changed
+            self._update_callback(changed_properties if changed_properties else None)
 
     def _update_failed(self, ex) -> None:
         """Call external listener when update failed"""
@@ -747,6 +792,7 @@ class DreameVacuumDevice:
                 if not self.status.lidar_navigation:
                     self._map_manager.set_vslam_map()
                 self._map_manager.set_update_interval(self._map_update_interval)
+                self._map_manager.set_multi_map(self.status.multi_map)
                 self._map_manager.set_device_running(
                     self.status.running, self.status.docked and not self.status.started
                 )
@@ -795,21 +841,36 @@ class DreameVacuumDevice:
                 self.token, self.host = self._protocol.cloud.get_info(self.mac)
                 self._protocol.set_credentials(self.host, self.token, self.mac)
 
+    @staticmethod
+    def shutdown() -> None:
+        """Release the resources shared between devices after the last device is disconnected"""
+        DreameMapVacuumMapManager.shutdown()
+
     def disconnect(self) -> None:
         """Disconnect from device and cancel timers"""
         _LOGGER.info("Disconnect")
+        with self._write_lock:
+            write_timer = self._write_timer
+        if write_timer:
+            # Send the pending property writes before the connection is closed
+            write_timer.cancel()
+            self._flush_property_writes()
         self.disconnected = True
         self.schedule_update(-1)
         self._protocol.disconnect()
         if self._map_manager:
-            self._map_manager.schedule_update(-1)
-        self._property_changed()
+            self._map_manager.disconnect()
+        self._property_changed(True)
 
     def listen(self, callback, property: DreameVacuumProperty = None) -> None:
         """Set callback functions for external listeners"""
         if callback is None:
             self._update_callback = None
             self._property_update_callback = {}
+            with self._notify_lock:
+                if self._notify_timer:
+                    self._notify_timer.cancel()
+                    self._notify_timer = None
             return
 
         if property is None:
@@ -843,9 +904,11 @@ class DreameVacuumDevice:
             return self.data[prop.value]
         return None
 
-    def set_property(self, prop: DreameVacuumProperty, value: Any) -> bool:
+    def set_property(self, prop: DreameVacuumProperty, value: Any) -> Future:
         """Sets property value using the existing property mapping and notify listeners
         Property must be set on memory first and notify its listeners because device does not return new value immediately.
+        Returned future is resolved with True when the device accepts the write, with False when the value is not changed
+        and fails with DeviceUpdateFailedException when the write fails.
         """
 
         self.schedule_update(10)
@@ -854,29 +917,95 @@ class DreameVacuumDevice:
             self._last_change = time.time()
             self._last_settings_request = 0
 
-            try:
-                mapping = self.property_mapping[prop]
-                result = self._protocol.set_property(mapping["siid"], mapping["piid"], value)
-
-                if result and result[0]["code"] != 0:
-                    _LOGGER.error("Property not updated: %s: %s -> %s", prop, current_value, value)
-                    self._update_property(prop, current_value)
-                    if prop.value in self._dirty_data:
-                        del self._dirty_data[prop.value]
-
-                # Schedule the update for getting the updated property value from the device
-                # If property is actually updated nothing will happen otherwise it will return to previous value and notify its listeners. (Post optimistic approach)
-                self.schedule_update(2)
-                return True
-            except Exception as ex:
-                self._update_property(prop, current_value)
-                if prop.value in self._dirty_data:
-                    del self._dirty_data[prop.value]
-                self.schedule_update(1)
-                raise DeviceUpdateFailedException("Set property failed %s: %s", prop.name, ex) from None
+            # Write is sent with the other writes that are made in the same period
+            return self._queue_property_write(prop, value, current_value)
 
         self.schedule_update(1)
-        return False
+        future = Future()
+        future.set_result(False)
+        return future
+
+    def _set_property_and_wait(self, prop: DreameVacuumProperty, value: Any) -> bool:
+        """Sets property value and waits for the device to accept it, for the writes that depend on the previous one."""
+        return self.set_property(prop, value).result()
+
+    def _queue_property_write(self, prop: DreameVacuumProperty, value: Any, current_value: Any) -> Future:
+        """Add the write to pending writes, last value of a property overrides the previous ones that are not sent yet"""
+        future = Future()
+        with self._write_lock:
+            write = self._pending_writes.get(prop)
+            if write:
+                write[0] = value
+                write[2].append(future)
+            else:
+                self._pending_writes[prop] = [value, current_value, [future]]
+
+            if self._write_timer is None:
+                self._write_timer = Timer(self.PROPERTY_WRITE_DELAY, self._flush_property_writes)
+                self._write_timer.start()
+        return future
+
+    def _revert_property_write(self, prop: DreameVacuumProperty, current_value: Any) -> None:
+        with self._write_lock:
+            # Newer value of the property is waiting to be sent
+            if prop in self._pending_writes:
+                return
+        self._update_property(prop, current_value)
+        if prop.value in self._dirty_data:
+            del self._dirty_data[prop.value]
+
+    def _flush_property_writes(self) -> None:
+        """Send pending property writes to the device with a single request and resolve their futures"""
+        with self._write_lock:
+            self._write_timer = None
+            writes = self._pending_writes
+            self._pending_writes = {}
+
+        if not writes:
+            return
+
+        parameters = []
+        for prop, write in writes.items():
+            mapping = self.property_mapping[prop]
+            parameters.append(
+                {
+                    "did": f"{mapping['siid']}.{mapping['piid']}",
+                    "siid": mapping["siid"],
+                    "piid": mapping["piid"],
+                    "value": write[0],
+                }
+            )
+
+        try:
+            results = self._protocol.set_properties(parameters)
+        except Exception as ex:
+            for prop, (value, current_value, futures) in writes.items():
+                _LOGGER.warning("Set property failed %s: %s", prop.name, ex)
+                self._revert_property_write(prop, current_value)
+                exception = DeviceUpdateFailedException("Set property failed %s: %s", prop.name, ex)
+                for future in futures:
+                    future.set_exception(exception)
+            self.schedule_update(1)
+            return
+
+        # Results may not be in the order of the parameters
+        codes = {str(result["did"]): result.get("code") for result in results if "did" in result} if results else {}
+        for parameter, (prop, (value, current_value, futures)) in zip(parameters, writes.items()):
+            code = codes.get(parameter["did"], 0)
+            if code != 0:
+                _LOGGER.error("Property not updated: %s: %s -> %s", prop, current_value, value)
+                self._revert_property_write(prop, current_value)
+                exception = DeviceUpdateFailedException("Property not updated %s: %s", prop.name, code)
+                for future in futures:
+                    future.set_exception(exception)
+                continue
+
+            for future in futures:
+                future.set_result(True)
+
+        # Schedule the update for getting the updated property value from the device
+        # If property is actually updated nothing will happen otherwise it will return to previous value and notify its listeners. (Post optimistic approach)
+        self.schedule_update(2)
 
     def get_map_for_render(self, map_index: int) -> MapData | None:
         """Makes changes on map data for device related properties for renderer.
@@ -886,15 +1015,16 @@ class DreameVacuumDevice:
 
         map_data = self.get_map(map_index)
         if map_data:
+            optimized = True
             if map_data.need_optimization:
-                map_data = self._map_manager.optimizer.optimize(
+                # Unoptimized map is rendered when optimization takes too long and rendered again when it is completed
+                optimized = self._map_manager.optimizer.optimize_in_time(
                     map_data, self._map_manager.selected_map if map_data.saved_map_status == 2 else None
                 )
-                map_data.need_optimization = False
 
-            map_data = copy.deepcopy(map_data)
+            map_data = map_data.view()
 
-            if map_data.optimized_pixel_type is not None:
+            if optimized and map_data.optimized_pixel_type is not None:
                 map_data.pixel_type = map_data.optimized_pixel_type
                 map_data.dimensions = map_data.optimized_dimensions
                 if map_data.optimized_charger_position is not None:
@@ -1107,6 +1237,7 @@ class DreameVacuumDevice:
 
         if self._map_manager:
             self._map_manager.set_update_interval(self._map_update_interval)
+            self._map_manager.set_multi_map(self.status.multi_map)
             self._map_manager.set_device_running(self.status.running, self.status.docked and not self.status.started)
 
         if self.cloud_connected:
@@ -1193,7 +1324,7 @@ class DreameVacuumDevice:
         self._protocol.send(command, parameters, 1)
         self.schedule_update(2)
 
-    def set_suction_level(self, suction_level: int) -> bool:
+    def set_suction_level(self, suction_level: int) -> Future:
         """Set suction level."""
         if self.status.started and (
             self.status.customized_cleaning and not (self.status.zone_cleaning or self.status.spot_cleaning)
@@ -1201,7 +1332,7 @@ class DreameVacuumDevice:
             raise InvalidActionException("Cannot set suction level when customized cleaning is enabled")
         return self.set_property(DreameVacuumProperty.SUCTION_LEVEL, int(suction_level))
 
-    def set_cleaning_mode(self, cleaning_mode: int) -> bool:
+    def set_cleaning_mode(self, cleaning_mode: int) -> Future:
         """Set cleaning mode."""
         if self.status.started:
             raise InvalidActionException("Cannot set cleaning mode while vacuum is running")
@@ -1243,7 +1374,7 @@ class DreameVacuumDevice:
 
         return self.set_property(DreameVacuumProperty.CLEANING_MODE, int(cleaning_mode))
 
-    def set_mop_pad_humidity(self, mop_pad_humidity: int) -> bool:
+    def set_mop_pad_humidity(self, mop_pad_humidity: int) -> Future | None:
         """Set mop pad humidity."""
         if self.status.self_wash_base_available:
             if self.status.started and (
@@ -1260,7 +1391,7 @@ class DreameVacuumDevice:
                     DreameVacuumProperty.CLEANING_MODE, DreameVacuumDevice.combine_group_value(values)
                 )
 
-    def set_water_volume(self, water_volume: int) -> bool:
+    def set_water_volume(self, water_volume: int) -> Future | None:
         """Set water volume."""
         if not self.status.self_wash_base_available:
             if self.status.started and (
@@ -1270,25 +1401,25 @@ class DreameVacuumDevice:
 
             return self.set_property(DreameVacuumProperty.WATER_VOLUME, int(water_volume))
 
-    def set_dnd_enabled(self, dnd_enabled: bool) -> bool:
+    def set_dnd_enabled(self, dnd_enabled: bool) -> Future:
         """Set do not disturb function"""
         return self.set_property(DreameVacuumProperty.DND, bool(dnd_enabled))
 
-    def set_dnd_start(self, dnd_start: str) -> bool:
+    def set_dnd_start(self, dnd_start: str) -> Future:
         """Set do not disturb function"""
         time_pattern = re.compile("([0-1][0-9]|2[0-3]):[0-5][0-9]$")
         if not re.match(time_pattern, dnd_start):
             raise InvalidValueException("DND start time is not valid: (%s).", dnd_start)
         return self.set_property(DreameVacuumProperty.DND_START, dnd_start)
 
-    def set_dnd_end(self, dnd_end: str) -> bool:
+    def set_dnd_end(self, dnd_end: str) -> Future:
         """Set do not disturb function"""
         time_pattern = re.compile("([0-1][0-9]|2[0-3]):[0-5][0-9]$")
         if not re.match(time_pattern, dnd_end):
             raise InvalidValueException("DND end time is not valid: (%s).", dnd_end)
         return self.set_property(DreameVacuumProperty.DND_END, dnd_end)
 
-    def set_self_clean_area(self, self_clean_area: int) -> bool:
+    def set_self_clean_area(self, self_clean_area: int) -> Future | None:
         """Set self clean area."""
         if self.status.self_wash_base_available:
             values = DreameVacuumDevice.split_group_value(
@@ -1838,9 +1969,17 @@ class DreameVacuumDevice:
         else:
             current_value = self.status.auto_drying
             self.status.auto_drying = 1 if enabled else 0
-            if not self.set_property(DreameVacuumProperty.INTELLIGENT_RECOGNITION, self.status.auto_drying):
+            try:
+                result = self._set_property_and_wait(
+                    DreameVacuumProperty.INTELLIGENT_RECOGNITION, self.status.auto_drying
+                )
+            except DeviceUpdateFailedException:
+                result = None
+            if not result:
                 self.status.auto_drying = current_value
                 self._property_changed()
+                if result is None:
+                    raise DeviceUpdateFailedException("Set auto drying failed")
                 return False
             return True
 
@@ -1872,20 +2011,20 @@ class DreameVacuumDevice:
                     value = 1
                 else:
                     value = 3 if self.get_property(DreameVacuumProperty.CARPET_BOOST) == 1 else 0
-                if self.set_property(DreameVacuumProperty.CARPET_RECOGNITION, value):
+                if self._set_property_and_wait(DreameVacuumProperty.CARPET_RECOGNITION, value):
                     if value == 1 and current_value == 3:
-                        self.set_property(DreameVacuumProperty.CARPET_BOOST, 1)
+                        self._set_property_and_wait(DreameVacuumProperty.CARPET_BOOST, 1)
                     else:
                         self._update_property(DreameVacuumProperty.CARPET_BOOST, 0)
 
     def set_multi_map(self, enabled: bool) -> bool:
-        if self.set_property(DreameVacuumProperty.MULTI_FLOOR_MAP, int(enabled)):
+        if self._set_property_and_wait(DreameVacuumProperty.MULTI_FLOOR_MAP, int(enabled)):
             if (
                 self.status.auto_switch_settings_available
                 and not enabled
                 and self.get_property(DreameVacuumProperty.INTELLIGENT_RECOGNITION) == 1
             ):
-                self.set_property(DreameVacuumProperty.INTELLIGENT_RECOGNITION, 0)
+                self._set_property_and_wait(DreameVacuumProperty.INTELLIGENT_RECOGNITION, 0)
             return True
         return False
 
@@ -2241,6 +2380,24 @@ class DreameVacuumDevice:
         return self._protocol.cloud and self._protocol.cloud.logged_in and self._protocol.cloud.connected
 
 
+def _memoized_property(func):
+    """Status property that is computed once and reused until a device property or the device status is changed."""
+    name = func.__name__
+
+    @wraps(func)
+    def getter(self):
+        # Key is taken before computing the value, so a change during computation causes it to be computed again
+        key = (self._device.data.version, self._cache_generation, self._device_connected)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        value = func(self)
+        self._cache[name] = (key, value)
+        return value
+
+    return property(getter)
+
+
 class DreameVacuumDeviceStatus:
     """Helper class for device status and int enum type properties.
     This class is used for determining various states of the device by its properties.
@@ -2285,6 +2442,12 @@ class DreameVacuumDeviceStatus:
 
     def __init__(self, device):
         self._device = device
+        self._cache: dict[str, tuple[tuple, Any]] = {}
+        self._cache_generation: int = 0
+
+    def invalidate_cache(self) -> None:
+        """Discard memoized properties after a change that is not recorded to the property store"""
+        self._cache_generation = self._cache_generation + 1
 
     def update_static_properties(self):
         self.lidar_navigation = bool(self._get_property(DreameVacuumProperty.MAP_SAVING) is None)
@@ -2308,6 +2471,7 @@ class DreameVacuumDeviceStatus:
             if self.self_wash_base_available and not self.mop_pad_lifting_available
             else 0 if self.lidar_navigation else 1
         )
+        self.invalidate_cache()
 
     def _get_property(self, prop: DreameVacuumProperty) -> Any:
         """Helper function for accessing a property from device"""
@@ -2373,7 +2537,7 @@ class DreameVacuumDeviceStatus:
         """Return mop pad humidity as string for translation."""
         return MOP_PAD_HUMIDITY_CODE_TO_NAME.get(self.mop_pad_humidity, STATE_UNKNOWN)
 
-    @property
+    @_memoized_property
     def cleaning_mode(self) -> DreameVacuumCleaningMode:
         """Return cleaning mode of the device."""
         value = self._get_property(DreameVacuumProperty.CLEANING_MODE)
@@ -2550,7 +2714,7 @@ class DreameVacuumDeviceStatus:
         """Return carpet sensitivity as string for translation."""
         return CARPET_SENSITIVITY_CODE_TO_NAME.get(self.carpet_sensitivity, STATE_UNKNOWN)
 
-    @property
+    @_memoized_property
     def state(self) -> DreameVacuumState:
         """Return state of the device."""
         value = self._get_property(DreameVacuumProperty.STATE)
@@ -2802,7 +2966,7 @@ class DreameVacuumDeviceStatus:
             )
         )
 
-    @property
+    @_memoized_property
     def segment_cleaning(self) -> bool:
         """Returns true when device is currently performing a custom segment cleaning task."""
         task_status = self.task_status
@@ -2886,7 +3050,7 @@ class DreameVacuumDeviceStatus:
         """Returns true when device is currently charging."""
         return bool(self.charging_status is DreameVacuumChargingStatus.CHARGING)
 
-    @property
+    @_memoized_property
     def docked(self) -> bool:
         """Returns true when device is docked."""
         return bool(
@@ -2919,7 +3083,7 @@ class DreameVacuumDeviceStatus:
         """Returns true when returning to dock for charging or washing."""
         return bool(self._device_connected and (self.status is DreameVacuumStatus.BACK_HOME or self.returning_to_wash))
 
-    @property
+    @_memoized_property
     def started(self) -> bool:
         """Returns true when device has an active task.
         Used for preventing updates on settings that relates to currently performing task."""
@@ -2945,7 +3109,7 @@ class DreameVacuumDeviceStatus:
         """Returns true when device is moving or not sleeping."""
         return self.status is DreameVacuumStatus.STANDBY or self.running
 
-    @property
+    @_memoized_property
     def running(self) -> bool:
         """Returns true when device is moving."""
         status = self.status
@@ -3252,7 +3416,8 @@ class DreameVacuumDeviceStatus:
 
     @property
     def map_data_list(self) -> dict[int, MapData] | None:
-        """Return the saved map data list if multi floor map is enabled"""
+        """Return the saved map data list if multi floor map is enabled, maps that are not decoded yet are not decoded
+        by this property and only have their metadata and segments"""
         if self.map_available:
             if self.multi_map:
                 return self._map_manager.map_data_list
@@ -3295,7 +3460,7 @@ class DreameVacuumDeviceStatus:
                 return list(map_data.segments.keys())
             return []
 
-    @property
+    @_memoized_property
     def job(self) -> dict[str, Any] | None:
         attributes = {ATTR_CLEANING_MODE: self.cleaning_mode.name, ATTR_STATUS: self.status.name}
         attributes[ATTR_WATER_TANK if not self.self_wash_base_available else ATTR_MOP_PAD] = (
@@ -3323,7 +3488,7 @@ class DreameVacuumDeviceStatus:
                 attributes[ATTR_ACTIVE_POINTS] = map_data.active_points
         return attributes
 
-    @property
+    @_memoized_property
     def attributes(self) -> dict[str, Any] | None:
         """Return the attributes of the device."""
         properties = [
@@ -3417,7 +3582,8 @@ class DreameVacuumDeviceStatus:
             attributes[ATTR_ROOMS] = {}
             for k, v in self.map_data_list.items():
                 attributes[ATTR_ROOMS][v.map_name] = [
-                    {ATTR_ID: j, ATTR_NAME: s.name, ATTR_ICON: s.icon} for (j, s) in sorted(v.segments.items())
+                    {ATTR_ID: j, ATTR_NAME: s.name, ATTR_ICON: s.icon}
+                    for (j, s) in sorted(v.segments.items() if v.segments else [])
                 ]
 
         return attributes
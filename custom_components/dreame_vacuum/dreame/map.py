@@ -9,6 +9,7 @@ import zlib
 import logging
 import traceback
 import copy
+import os
 import numpy as np
 import hashlib
 from py_mini_racer import MiniRacer
@@ -19,8 +20,11 @@ from typing import Any
 from time import sleep
 from io import BytesIO
 from typing import Optional, Tuple
-from functools import cmp_to_key
-from threading import Timer
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import CancelledError, Executor, Future, ThreadPoolExecutor
+from functools import cmp_to_key, lru_cache
+from threading import Condition, Event, Thread, Timer, RLock, get_ident
 from .resources import *
 from .protocol import DreameVacuumProtocol
 from .exceptions import DeviceUpdateFailedException
@@ -38,7 +42,7 @@ from .types import (
     MapData,
     MapFrameType,
     MapPixelType,
-    Path,
+    MapPath,
     Area,
     Wall,
     Segment,
@@ -46,8 +50,10 @@ from .types import (
     MapRendererLayer,
     MapRendererColorScheme,
     MapRendererConfig,
+    MapRendererImageFormat,
     MAP_COLOR_SCHEME_LIST,
     MAP_ICON_SET_LIST,
+    MAP_IMAGE_FORMAT_LIST,
     ALine,
     CLine,
     Paths,
@@ -121,7 +127,14 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class DreameMapVacuumMapManager:
-    def __init__(self, _protocol: DreameVacuumProtocol) -> None:
+    def __init__(
+        self,
+        _protocol: DreameVacuumProtocol,
+        cache_path: str = None,
+        parallel_map_decoding: bool = False,
+        optimizer_pool_size: int = None,
+        optimization_timeout: float = None,
+    ) -> None:
         self._map_list_object_name: str = None
         self._map_list_md5: str = None
         self._recovery_map_list_object_name: str = None
@@ -136,12 +149,18 @@ class DreameMapVacuumMapManager:
         self._ready: bool = False
         self._connected: bool = True
         self._vslam_map: bool = False
+        self._parallel_map_decoding: bool = parallel_map_decoding
+        if optimizer_pool_size:
+            DreameVacuumMapOptimizerPool.set_size(optimizer_pool_size)
 
         self._init_data()
 
         self._protocol = _protocol
         self.editor = DreameMapVacuumMapEditor(self)
-        self.optimizer = DreameVacuumMapOptimizer()
+        self.optimizer = DreameVacuumMapOptimizer(cache_path)
+        self.optimizer.listen(self._map_data_changed)
+        if optimization_timeout is not None:
+            self.optimizer.set_timeout(optimization_timeout)
 
     def _init_data(self) -> None:
         self._map_data: MapData = None
@@ -149,7 +168,7 @@ class DreameMapVacuumMapManager:
         self._current_map_id: int = None
         self._current_timestamp_ms: int = None
         self._file_urls: dict[str, str] = {}
-        self._saved_map_data: dict[int, MapData] = {}
+        self._saved_map_data: DreameVacuumSavedMapList = DreameVacuumSavedMapList()
         self._map_list: list[int] = []
         self._recovery_map_data: dict[int, MapData] = {}
         self._need_map_request: bool = False
@@ -171,6 +190,8 @@ class DreameMapVacuumMapManager:
         self._map_request_count: int = 0
         self._new_map_request_time: int = None
         self._aes_iv: str = None
+        self._decoder_context: DreameVacuumMapDecoderContext = DreameVacuumMapDecoderContext()
+        self._multi_map: bool = False
 
     def _request_map_from_cloud(self) -> bool:
         if self._current_timestamp_ms is not None:
@@ -591,7 +612,7 @@ class DreameMapVacuumMapManager:
         return url
 
     def _decode_map_partial(self, raw_map, timestamp=None, key=None) -> MapDataPartial | None:
-        partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, self._aes_iv, key)
+        partial_map = DreameVacuumMapDecoder.decode_map_partial(raw_map, self._aes_iv, key, self._decoder_context)
         if partial_map is not None:
             # After restart or unsuccessful start robot returns timestamp_ms as uptime and that messes up with the latest map/frame id detection.
             # I could not figure out how app handles with this issue but i have added this code to update time stamp as request/object time.
@@ -758,7 +779,8 @@ class DreameMapVacuumMapManager:
                         saved_map_data.timestamp_ms = map_data.timestamp_ms
                         if (
                             saved_map_data != self._saved_map_data[saved_map_data.map_id]
-                            or saved_map_data.segments != self._saved_map_data[saved_map_data.map_id].segments
+                            or saved_map_data.segment_fingerprint
+                            != self._saved_map_data[saved_map_data.map_id].segment_fingerprint
                         ):
                             saved_map_data.last_updated = time.time()
                             self._saved_map_data[saved_map_data.map_id] = saved_map_data
@@ -813,7 +835,7 @@ class DreameMapVacuumMapManager:
                         self._current_frame_id is None
                         or self._map_data is None
                         or map_data != self._map_data
-                        or map_data.segments != self._map_data.segments
+                        or map_data.segment_fingerprint != self._map_data.segment_fingerprint
                     )
 
                     if (
@@ -851,6 +873,7 @@ class DreameMapVacuumMapManager:
                             and not self._map_data.need_optimization
                         ):
                             map_data.need_optimization = False
+                            map_data.dirty_tiles = self._map_data.dirty_tiles
                             map_data.optimized_pixel_type = copy.deepcopy(self._map_data.optimized_pixel_type)
                             map_data.optimized_dimensions = copy.deepcopy(self._map_data.optimized_dimensions)
                             map_data.optimized_charger_position = copy.deepcopy(
@@ -889,7 +912,8 @@ class DreameMapVacuumMapManager:
     def _refresh_map_list(self) -> None:
         index = 1
         new_map_list = []
-        for map_id, saved_map_data in sorted(self._saved_map_data.items()):
+        for map_id in sorted(self._saved_map_data):
+            saved_map_data = self._saved_map_data.peek(map_id)
             new_map_list.append(map_id)
             if saved_map_data.custom_name is None:
                 saved_map_data.map_name = f"Map {str(index)}"
@@ -906,12 +930,23 @@ class DreameMapVacuumMapManager:
             return None
         return self._map_data
 
+    @staticmethod
+    def shutdown() -> None:
+        """Releases the resources shared between map managers, it should be called when there is no manager left."""
+        DreameVacuumSavedMapList.shutdown()
+        DreameVacuumMapOptimizerPool.shutdown()
+
     def listen(self, callback) -> None:
         self._update_callback = callback
 
     def listen_error(self, callback) -> None:
         self._error_callback = callback
 
+    def disconnect(self) -> None:
+        """Stops map updates and optimizations of the device."""
+        self.schedule_update(-1)
+        self.optimizer.shutdown()
+
     def schedule_update(self, wait: float = None) -> None:
         if not wait:
             wait = self._update_interval
@@ -936,6 +971,10 @@ class DreameMapVacuumMapManager:
             ):
                 self.request_map_list()
 
+            if self._multi_map and self._saved_map_data.decode_segments():
+                # Rooms of all saved maps are listed when multi floor map is enabled
+                self._map_data_changed()
+
             # Not supported Yet
             # if self._recovery_map_list_object_name and self._need_recovery_map_list_request is None or (self._need_recovery_map_list_request and not self._device_running):
             #    self.request_recovery_map_list()
@@ -982,12 +1021,17 @@ class DreameMapVacuumMapManager:
         self._ready = True
         self._update_running = False
 
+    def set_multi_map(self, multi_map: bool) -> None:
+        self._multi_map = multi_map
+
     def set_aes_iv(self, aes_iv: str) -> None:
         if aes_iv:
             self._aes_iv = aes_iv
+            self._decoder_context = DreameVacuumMapDecoderContext(aes_iv)
 
     def set_vslam_map(self) -> None:
         self._vslam_map = True
+        DreameVacuumMapOptimizerPool.warm_up()
 
     def set_update_interval(self, update_interval: float) -> None:
         if self._update_interval != update_interval:
@@ -1013,6 +1057,7 @@ class DreameMapVacuumMapManager:
                     # self._map_data.restored_map = True
                     self._map_data.path = None
                     self._map_data.need_optimization = False
+                    self._map_data.dirty_tiles = None
                     self._map_data.saved_map_status = 2
                     self._map_data.last_updated = time.time()
                     self._map_data_changed()
@@ -1099,47 +1144,64 @@ class DreameMapVacuumMapManager:
                 if saved_map_list:
                     for v in saved_map_list:
                         if v.get(MAP_PARAMETER_MAP):
-                            saved_map_data = DreameVacuumMapDecoder.decode_saved_map(
-                                v[MAP_PARAMETER_MAP],
-                                self._vslam_map,
-                                int(v[MAP_PARAMETER_ANGLE]) if v.get(MAP_PARAMETER_ANGLE) else 0,
-                                self._aes_iv,
-                            )
-                            if saved_map_data is not None:
+                            # Only the header and data json are decoded here, pixels and segments of the saved map
+                            # are decoded when the map is accessed for the first time.
+                            partial_map = DreameVacuumMapDecoder.decode_map_partial(v[MAP_PARAMETER_MAP], self._aes_iv)
+                            if partial_map is not None:
+                                saved_map_data = MapData()
+                                saved_map_data.map_id = partial_map.map_id
+                                saved_map_data.saved_map = True
+                                saved_map_data.rotation = (
+                                    int(v[MAP_PARAMETER_ANGLE]) if v.get(MAP_PARAMETER_ANGLE) else 0
+                                )
+                                if partial_map.data_json and "mra" in partial_map.data_json:
+                                    saved_map_data.rotation = int(partial_map.data_json["mra"])
                                 name = v.get(MAP_PARAMETER_NAME)
                                 if name:
                                     saved_map_data.custom_name = name
                                     saved_map_data.map_name = name
-                                map_list[saved_map_data.map_id] = saved_map_data
+                                map_list[saved_map_data.map_id] = (saved_map_data, v[MAP_PARAMETER_MAP])
 
-                    for map_id, saved_map_data in sorted(map_list.items()):
+                    for map_id, (saved_map_data, raw_map) in sorted(map_list.items()):
                         if map_id in self._saved_map_data:
+                            current_map_data = self._saved_map_data.peek(map_id)
                             if self._selected_map_id == map_id and self._map_data:
                                 saved_map_data.cleanset = self._map_data.cleanset
                             else:
-                                saved_map_data.cleanset = self._saved_map_data[map_id].cleanset
+                                saved_map_data.cleanset = current_map_data.cleanset
 
-                            if self._saved_map_data[map_id] != saved_map_data:
+                            if (
+                                self._saved_map_data.payload(map_id) != raw_map
+                                or current_map_data.custom_name != saved_map_data.custom_name
+                                or current_map_data.rotation != saved_map_data.rotation
+                            ):
                                 _LOGGER.info("Saved map changed: %s", map_id)
                                 changed = True
                                 saved_map_data.last_updated = now
                                 if self._map_data is None or self._selected_map_id != map_id:
-                                    self._saved_map_data[map_id] = saved_map_data
+                                    self._saved_map_data.add(
+                                        map_id, saved_map_data, raw_map, self._vslam_map, self._aes_iv
+                                    )
                                 else:
                                     self._saved_map_data[map_id].custom_name = saved_map_data.custom_name
                                     self._saved_map_data[map_id].rotation = saved_map_data.rotation
+                                    self._saved_map_data.set_payload(map_id, raw_map, self._vslam_map, self._aes_iv)
                         else:
                             saved_map_data.last_updated = now
-                            self._saved_map_data[map_id] = saved_map_data
+                            self._saved_map_data.add(map_id, saved_map_data, raw_map, self._vslam_map, self._aes_iv)
                             _LOGGER.info("Add saved map: %s", map_id)
                             changed = True
 
-                current_map_list = self._saved_map_data.copy()
-                for map_id in current_map_list.keys():
+                for map_id in list(self._saved_map_data):
                     if map_id not in map_list:
                         del self._saved_map_data[map_id]
                         changed = True
 
+                self._saved_map_data.evict(self._selected_map_id)
+                if self._multi_map and self._parallel_map_decoding:
+                    # All saved maps are rendered and listed when multi floor map is enabled
+                    self._saved_map_data.decode()
+
                 selected_map_id = map_info[MAP_PARAMETER_CURR_ID]
                 if selected_map_id in self._saved_map_data and self._selected_map_id != selected_map_id:
                     self._selected_map_id = selected_map_id
@@ -1177,7 +1239,7 @@ class DreameMapVacuumMapManager:
                                 recovery_map_data = DreameVacuumMapDecoder.decode_saved_map(
                                     map_info[MAP_PARAMETER_THB],
                                     self._vslam_map,
-                                    self._saved_map_data[map_id].rotation,
+                                    self._saved_map_data.peek(map_id).rotation,
                                     self._aes_iv,
                                 )
                                 # TODO: store recovery map
@@ -1202,7 +1264,8 @@ class DreameMapVacuumMapManager:
 
     @property
     def map_data_list(self) -> dict[int, MapData] | None:
-        return self._saved_map_data
+        """Saved maps without decoding them, maps that are not decoded yet only have their metadata and segments."""
+        return self._saved_map_data.peek_all()
 
     @property
     def selected_map(self) -> MapData | None:
@@ -1345,7 +1408,7 @@ class DreameMapVacuumMapEditor:
             self.map_manager._map_data = None
             self.map_manager._selected_map_id = None
             self.map_manager._updated_frame_id = None
-            self.map_manager._saved_map_data = {}
+            self.map_manager._saved_map_data.clear()
             self.map_manager._refresh_map_list()
             self.map_manager.request_next_map_list()
         else:
@@ -1375,6 +1438,8 @@ class DreameMapVacuumMapEditor:
                     return
 
                 data = np.zeros((map_data.dimensions.width * map_data.dimensions.height), np.uint8)
+                # Pixel type may be shared with the decoded saved map cache and map views
+                map_data.pixel_type = map_data.pixel_type.copy()
                 for y in range(map_data.dimensions.height):
                     for x in range(map_data.dimensions.width):
                         index = y * map_data.dimensions.width + x
@@ -1746,8 +1811,244 @@ class DreameMapVacuumMapEditor:
         return self.map_manager._current_timestamp_ms
 
 
+class DreameVacuumSavedMapList(MutableMapping):
+    """Saved maps received with the map list are kept as their compressed payload and decoded when they are accessed
+    for the first time. Decoded maps that are not used for a while can be turned back to their compressed form."""
+
+    DECODED_MAP_TIMEOUT = 1800
+    DECODE_THREADS = min(4, os.cpu_count() or 1)
+    _executor: ThreadPoolExecutor = None
+    _executor_lock: RLock = RLock()
+
+    def __init__(self) -> None:
+        self._maps: dict[int, MapData] = {}
+        self._payloads: dict[int, tuple] = {}
+        self._pending: set[int] = set()
+        self._evicted: set[int] = set()
+        self._access_time: dict[int, float] = {}
+        # Maps are decoded on map manager and renderer threads and listed on the event loop
+        self._lock: RLock = RLock()
+
+    @staticmethod
+    def _metadata(map_data: MapData) -> MapData:
+        metadata = MapData()
+        metadata.map_id = map_data.map_id
+        metadata.custom_name = map_data.custom_name
+        metadata.map_name = map_data.map_name
+        metadata.map_index = map_data.map_index
+        metadata.rotation = map_data.rotation
+        metadata.cleanset = map_data.cleanset
+        metadata.last_updated = map_data.last_updated
+        # Segments are kept so rooms of the map can still be listed without decoding it again
+        metadata.segments = map_data.segments
+        metadata.saved_map = True
+        return metadata
+
+    def add(self, map_id: int, metadata: MapData, raw_map: str, vslam_map: bool, iv: str = None) -> None:
+        """Adds a saved map without decoding it, metadata only carries the values received with the map list."""
+        with self._lock:
+            current = self._maps.get(map_id)
+            if current is not None and metadata.segments is None and self.payload(map_id) == raw_map:
+                # Only the name or the rotation of the map is changed
+                metadata.segments = current.segments
+            self._maps[map_id] = metadata
+            self._payloads[map_id] = (raw_map, vslam_map, iv)
+            self._pending.add(map_id)
+            self._evicted.discard(map_id)
+            self._access_time.pop(map_id, None)
+
+    def peek(self, map_id: int) -> MapData:
+        """Returns the map data without decoding, only metadata and the segments of the maps that are decoded before
+        are available if the map is not decoded yet."""
+        return self._maps[map_id]
+
+    def peek_all(self) -> dict[int, MapData]:
+        """Returns all maps without decoding them."""
+        with self._lock:
+            return dict(self._maps)
+
+    def payload(self, map_id: int) -> str | None:
+        payload = self._payloads.get(map_id)
+        return payload[0] if payload else None
+
+    def set_payload(self, map_id: int, raw_map: str, vslam_map: bool, iv: str = None) -> None:
+        """Updates the payload of a decoded map that will be used after it is evicted."""
+        with self._lock:
+            if map_id in self._maps:
+                self._payloads[map_id] = (raw_map, vslam_map, iv)
+
+    def evict(self, selected_map_id: int = None) -> None:
+        now = time.time()
+        with self._lock:
+            for map_id, access_time in list(self._access_time.items()):
+                if (
+                    map_id != selected_map_id
+                    and map_id in self._payloads
+                    and now - access_time > DreameVacuumSavedMapList.DECODED_MAP_TIMEOUT
+                ):
+                    _LOGGER.debug("Evict decoded saved map: %s", map_id)
+                    self._maps[map_id] = DreameVacuumSavedMapList._metadata(self._maps[map_id])
+                    self._pending.add(map_id)
+                    self._evicted.add(map_id)
+                    del self._access_time[map_id]
+
+    @staticmethod
+    def _thread_pool() -> Executor | None:
+        # Threads instead of processes, decompression, decryption and numpy operations release the GIL and worker
+        # processes would need to import Home Assistant and pickle the decoded maps back
+        with DreameVacuumSavedMapList._executor_lock:
+            if DreameVacuumSavedMapList._executor is None and DreameVacuumSavedMapList.DECODE_THREADS > 1:
+                DreameVacuumSavedMapList._executor = ThreadPoolExecutor(
+                    DreameVacuumSavedMapList.DECODE_THREADS, thread_name_prefix="dreame_saved_map_decoder"
+                )
+            return DreameVacuumSavedMapList._executor
+
+    @staticmethod
+    def shutdown() -> None:
+        """Stops the worker threads, they are started again when they are needed."""
+        with DreameVacuumSavedMapList._executor_lock:
+            if DreameVacuumSavedMapList._executor is not None:
+                DreameVacuumSavedMapList._executor.shutdown(wait=False, cancel_futures=True)
+                DreameVacuumSavedMapList._executor = None
+
+    def _payload_args(self, map_id: int) -> tuple:
+        raw_map, vslam_map, iv = self._payloads[map_id]
+        return (raw_map, vslam_map, self._maps[map_id].rotation, iv)
+
+    def _set_decoded(self, map_id: int, payload: tuple, saved_map_data: MapData) -> bool:
+        """Sets the decoded map if its payload is not changed or it is not decoded by another thread meanwhile."""
+        with self._lock:
+            if map_id not in self._pending or self._payloads.get(map_id) is not payload:
+                return False
+
+            map_data = self._maps[map_id]
+            saved_map_data.custom_name = map_data.custom_name
+            saved_map_data.map_name = map_data.map_name
+            saved_map_data.map_index = map_data.map_index
+            saved_map_data.rotation = map_data.rotation
+            saved_map_data.cleanset = map_data.cleanset
+            saved_map_data.last_updated = map_data.last_updated
+            self._maps[map_id] = saved_map_data
+            self._pending.discard(map_id)
+            self._evicted.discard(map_id)
+            self._access_time[map_id] = time.time()
+            return True
+
+    def _decode(self, map_ids: list[int], executor: Executor = None) -> bool:
+        # Maps are decoded without holding the lock so listing the maps is not blocked by decoding
+        with self._lock:
+            map_ids = [map_id for map_id in map_ids if map_id in self._pending]
+            payloads = [self._payloads[map_id] for map_id in map_ids]
+            args = [self._payload_args(map_id) for map_id in map_ids]
+        if not map_ids:
+            return False
+
+        try:
+            results = DreameVacuumMapDecoder.decode_saved_maps(args, executor)
+        except Exception as ex:
+            if executor is None:
+                raise
+            _LOGGER.warning("Decode saved maps on worker threads failed: %s", ex)
+            DreameVacuumSavedMapList.shutdown()
+            results = DreameVacuumMapDecoder.decode_saved_maps(args)
+
+        decoded = False
+        for map_id, payload, saved_map_data in zip(map_ids, payloads, results):
+            if saved_map_data is not None and self._set_decoded(map_id, payload, saved_map_data):
+                decoded = True
+        return decoded
+
+    def decode(self) -> None:
+        """Decodes all pending maps at once on worker threads instead of one by one when they are accessed.
+        Evicted maps are left to be decoded on their next access."""
+        with self._lock:
+            map_ids = sorted(self._pending - self._evicted)
+        if len(map_ids) >= 2:
+            self._decode(map_ids, DreameVacuumSavedMapList._thread_pool())
+
+    def decode_segments(self) -> bool:
+        """Decodes the maps that are never decoded so their rooms can be listed without decoding them on the thread
+        that lists them. Returns True if any map is decoded."""
+        with self._lock:
+            map_ids = sorted(map_id for map_id in self._pending if self._maps[map_id].segments is None)
+        return self._decode(map_ids)
+
+    def __getitem__(self, map_id: int) -> MapData:
+        with self._lock:
+            pending = map_id in self._pending
+
+        if pending:
+            self._decode([map_id])
+
+        with self._lock:
+            if map_id in self._payloads and map_id not in self._pending:
+                self._access_time[map_id] = time.time()
+            return self._maps[map_id]
+
+    def __setitem__(self, map_id: int, map_data: MapData) -> None:
+        # Map data that is not decoded from the map list payload cannot be evicted
+        with self._lock:
+            self._maps[map_id] = map_data
+            self._payloads.pop(map_id, None)
+            self._pending.discard(map_id)
+            self._evicted.discard(map_id)
+            self._access_time.pop(map_id, None)
+
+    def __delitem__(self, map_id: int) -> None:
+        with self._lock:
+            del self._maps[map_id]
+            self._payloads.pop(map_id, None)
+            self._pending.discard(map_id)
+            self._evicted.discard(map_id)
+            self._access_time.pop(map_id, None)
+
+    def __contains__(self, map_id: int) -> bool:
+        return map_id in self._maps
+
+    def __iter__(self):
+        return iter(list(self._maps))
+
+    def __len__(self) -> int:
+        return len(self._maps)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._maps.clear()
+            self._payloads.clear()
+            self._pending.clear()
+            self._evicted.clear()
+            self._access_time.clear()
+
+
+class DreameVacuumMapDecoderContext:
+    """Keeps derived AES keys and ciphers of a device so they are not recreated for every encrypted map frame."""
+
+    CIPHER_CACHE_SIZE = 16
+
+    def __init__(self, iv: str = None) -> None:
+        self.iv = iv
+        self._ciphers: dict[str, Cipher] = {}
+
+    def cipher(self, key: str) -> Cipher:
+        cipher = self._ciphers.get(key)
+        if cipher is None:
+            derived_key = hashlib.sha256(key.encode()).hexdigest()[0:32].encode("utf8")
+            iv = self.iv if self.iv is not None else ""
+            cipher = Cipher(algorithms.AES(derived_key), modes.CBC(iv.encode("utf8")), backend=default_backend())
+            # Object file keys can be different for every file
+            if len(self._ciphers) >= DreameVacuumMapDecoderContext.CIPHER_CACHE_SIZE:
+                del self._ciphers[next(iter(self._ciphers))]
+            self._ciphers[key] = cipher
+        return cipher
+
+
 class DreameVacuumMapDecoder:
     HEADER_SIZE = 27
+    SAVED_MAP_CACHE_SIZE = 8
+    _saved_map_cache: OrderedDict[tuple, MapData] = OrderedDict()
+    _saved_map_cache_lock: RLock = RLock()
+    PATH_OPERATORS = np.frombuffer(b"MWSLl", dtype=np.uint8)
+    PATH_TRANSLATION = str.maketrans("MWSLl,", "      ")
 
     @staticmethod
     def _read_int_8(data: bytes, offset: int = 0) -> int:
@@ -1877,7 +2178,9 @@ class DreameVacuumMapDecoder:
         return None
 
     @staticmethod
-    def decode_map_partial(raw_map, iv=None, key=None) -> MapDataPartial | None:
+    def decode_map_partial(
+        raw_map, iv=None, key=None, context: DreameVacuumMapDecoderContext = None
+    ) -> MapDataPartial | None:
         _LOGGER.debug("raw_map: %s", raw_map)
         raw_map = raw_map.replace("_", "/").replace("-", "+")
 
@@ -1889,12 +2192,10 @@ class DreameVacuumMapDecoder:
         raw_map = base64.decodebytes(raw_map.encode("utf8"))
 
         if key is not None:
-            if iv is None:
-                iv = ""
+            if context is None or context.iv != iv:
+                context = DreameVacuumMapDecoderContext(iv)
             try:
-                key = hashlib.sha256(key.encode()).hexdigest()[0:32].encode("utf8")
-                cipher = Cipher(algorithms.AES(key), modes.CBC(iv.encode("utf8")), backend=default_backend())
-                decryptor = cipher.decryptor()
+                decryptor = context.cipher(key).decryptor()
                 raw_map = decryptor.update(raw_map) + decryptor.finalize()
             except Exception as ex:
                 _LOGGER.error(
@@ -1940,8 +2241,77 @@ class DreameVacuumMapDecoder:
 
     @staticmethod
     def decode_saved_map(raw_map: str, vslam_map: bool, rotation: int = 0, iv: str = None) -> MapData | None:
+        return DreameVacuumMapDecoder.decode_saved_maps([(raw_map, vslam_map, rotation, iv)])[0]
+
+    @staticmethod
+    def _decode_saved_map(raw_map: str, vslam_map: bool, rotation: int, iv: str) -> MapData | None:
         return DreameVacuumMapDecoder.decode_map(raw_map, vslam_map, rotation, iv)[0]
 
+    @staticmethod
+    def decode_saved_maps(payloads: list[tuple], executor: Executor = None) -> list[MapData | None]:
+        """Decodes (raw_map, vslam_map, rotation, iv) payloads of saved maps.
+        Maps that are not in the cache are decoded in parallel when an executor is provided."""
+        # Same saved map is embedded to every I frame, decode it once and return views of the cached map data
+        cache = DreameVacuumMapDecoder._saved_map_cache
+        keys = [
+            (hashlib.blake2b(raw_map.encode(), digest_size=16).digest(), vslam_map, rotation, iv)
+            for raw_map, vslam_map, rotation, iv in payloads
+        ]
+        results = [None] * len(payloads)
+        missing = []
+        with DreameVacuumMapDecoder._saved_map_cache_lock:
+            for index, key in enumerate(keys):
+                map_data = cache.get(key)
+                if map_data is not None:
+                    cache.move_to_end(key)
+                    results[index] = map_data
+                else:
+                    missing.append(index)
+
+        if missing:
+            if executor is not None and len(missing) > 1:
+                decoded = executor.map(
+                    DreameVacuumMapDecoder._decode_saved_map, *zip(*[payloads[index] for index in missing])
+                )
+            else:
+                decoded = [DreameVacuumMapDecoder._decode_saved_map(*payloads[index]) for index in missing]
+
+            for index, map_data in zip(missing, decoded):
+                results[index] = map_data
+                if map_data is not None:
+                    with DreameVacuumMapDecoder._saved_map_cache_lock:
+                        cache[keys[index]] = map_data
+                        cache.move_to_end(keys[index])
+                        while len(cache) > DreameVacuumMapDecoder.SAVED_MAP_CACHE_SIZE:
+                            cache.popitem(last=False)
+
+        return [map_data.view() if map_data is not None else None for map_data in results]
+
+    @staticmethod
+    def decode_path(path: str) -> MapPath:
+        operators = np.frombuffer(path.encode(), dtype=np.uint8)
+        operators = operators[np.isin(operators, DreameVacuumMapDecoder.PATH_OPERATORS)]
+        values = path.translate(DreameVacuumMapDecoder.PATH_TRANSLATION).split()
+        if len(values) != len(operators) * 2:
+            # Fall back to the regex parser when the string is malformed
+            matches = re.findall(r"([MWSLl])(-?\d+),(-?\d+)", path)
+            operators = np.frombuffer("".join(m[0] for m in matches).encode(), dtype=np.uint8)
+            values = [v for m in matches for v in m[1:]]
+
+        values = np.array(values, dtype=np.int64).reshape(-1, 2)
+        absolute = operators != MapPath.LINE
+
+        # "L" paths are relative to the previous point and others are absolute so every point is the sum of the
+        # values since the last absolute point.
+        offsets = np.concatenate(([[0, 0]], np.cumsum(values, axis=0)))
+        starts = np.concatenate(([0], np.flatnonzero(absolute)))[np.cumsum(absolute)]
+        positions = offsets[1:] - offsets[starts]
+
+        # You will only get "l" paths with in a P frame.
+        # It means path is connected with the path from previous frame and it should be rendered as a line.
+        operators = np.where(operators == ord("l"), MapPath.LINE, operators)
+        return MapPath(positions[:, 0], positions[:, 1], operators)
+
     @staticmethod
     def decode_map_data_from_partial(
         partial_map: MapDataPartial, vslam_map: bool, rotation: int = 0
@@ -2027,27 +2397,7 @@ class DreameVacuumMapDecoder:
             map_data.index = 0
 
         if data_json.get("tr"):
-            matches = [
-                m.groupdict()
-                for m in re.compile(r"(?P<operator>[MWSLl])(?P<x>-?\d+),(?P<y>-?\d+)").finditer(data_json["tr"])
-            ]
-            current_position = Point(0, 0)
-            map_data.path = []
-            for match in matches:
-                operator = match["operator"]
-                x = int(match["x"])
-                y = int(match["y"])
-
-                if operator == "L":
-                    current_position = Path(current_position.x + x, current_position.y + y, PathType.LINE)
-                else:
-                    # You will only get "l" paths with in a P frame.
-                    # It means path is connected with the path from previous frame and it should be rendered as a line.
-                    if operator == "l":
-                        operator = "L"
-                    current_position = Path(x, y, PathType(operator))
-
-                map_data.path.append(current_position)
+            map_data.path = DreameVacuumMapDecoder.decode_path(data_json["tr"])
 
         if data_json.get("sa") and isinstance(data_json["sa"], list):
             map_data.active_segments = [sa[0] for sa in data_json["sa"]]
@@ -2435,6 +2785,28 @@ class DreameVacuumMapDecoder:
             current_map_data.dimensions = MapImageDimensions(top, left, height, width, grid_size)
 
             if vslam_map:
+                # Mark the tiles changed by this frame so optimizer only needs to process them, whole map needs to be
+                # optimized again if image size is changed or previous changes are not optimized as a whole yet.
+                # Flags are set after the buffer is replaced for the optimizer running on background to detect changes.
+                if current_map_data.dirty_tiles is not None and (
+                    current_dimensions.top == top
+                    and current_dimensions.left == left
+                    and current_dimensions.height == height
+                    and current_dimensions.width == width
+                ):
+                    tile_size = DreameVacuumMapOptimizer.TILE_SIZE
+                    changed = np.flatnonzero(
+                        np.frombuffer(map_data.data, np.uint8, new_dimensions.width * new_dimensions.height)
+                    )
+                    tiles = np.unique(
+                        (((changed % new_dimensions.width) + left_offset) // tile_size)
+                        + (((changed // new_dimensions.width) + top_offset) // tile_size) * width
+                    )
+                    current_map_data.dirty_tiles = current_map_data.dirty_tiles | set(
+                        zip((tiles % width).tolist(), (tiles // width).tolist())
+                    )
+                else:
+                    current_map_data.dirty_tiles = None
                 current_map_data.need_optimization = True
 
         if map_data.path:
@@ -2599,6 +2971,115 @@ class DreameVacuumMapDecoder:
             map_data.segments[i].color_index = area_color_index[i]
 
 
+class DreameVacuumMapRendererResources:
+    """Process wide cache for decoded renderer resources.
+    Every camera entity has its own renderer instance and without this cache each of them decodes the same icons, images and font from base64 strings.
+    Returned images are shared between renderers and must not be modified in place."""
+
+    _lock: RLock = RLock()
+    _images: dict[str, Image.Image] = {}
+    _icon_sets: dict[tuple[int, bool], dict[str, Any]] = {}
+    _obstacle_icons: dict[int, Image.Image] = None
+    _default_map_image: Image.Image = None
+    _font_file: bytes = None
+
+    @classmethod
+    def image(cls, data: str) -> Image.Image:
+        image = cls._images.get(data)
+        if image is None:
+            with cls._lock:
+                image = cls._images.get(data)
+                if image is None:
+                    image = Image.open(BytesIO(base64.b64decode(data))).convert("RGBA")
+                    image.load()
+                    cls._images[data] = image
+        return image
+
+    @classmethod
+    def icon_set(cls, icon_set: int, invert: bool = False) -> dict[str, Any]:
+        key = (icon_set, invert)
+        icons = cls._icon_sets.get(key)
+        if icons is None:
+            with cls._lock:
+                icons = cls._icon_sets.get(key)
+                if icons is None:
+                    segment_icons = SEGMENT_ICONS_DREAME
+                    repeats = MAP_ICON_REPEATS_DREAME
+                    suction_level = MAP_ICON_SUCTION_LEVEL_DREAME
+                    water_volume = MAP_ICON_WATER_VOLUME_DREAME
+                    cleaning_mode = MAP_ICON_CLEANING_MODE_DREAME
+
+                    if icon_set == 1:
+                        segment_icons = SEGMENT_ICONS_DREAME_OLD
+                    elif icon_set == 2:
+                        segment_icons = SEGMENT_ICONS_MIJIA
+                        repeats = MAP_ICON_REPEATS_MIJIA
+                        suction_level = MAP_ICON_SUCTION_LEVEL_MIJIA
+                        water_volume = MAP_ICON_WATER_VOLUME_MIJIA
+                        cleaning_mode = MAP_ICON_CLEANING_MODE_MIJIA
+                    elif icon_set == 3:
+                        segment_icons = SEGMENT_ICONS_MATERIAL
+                        repeats = MAP_ICON_REPEATS_MATERIAL
+                        suction_level = MAP_ICON_SUCTION_LEVEL_MATERIAL
+                        water_volume = MAP_ICON_WATER_VOLUME_MATERIAL
+                        cleaning_mode = MAP_ICON_CLEANING_MODE_MATERIAL
+
+                    icons = {
+                        "segment": {},
+                        "cleaning_times": [cls.image(icon) for icon in repeats],
+                        "suction_level": [cls.image(icon) for icon in suction_level],
+                        "water_volume": [cls.image(icon) for icon in water_volume],
+                        "cleaning_mode": [cls.image(icon) for icon in cleaning_mode],
+                    }
+
+                    for k, v in segment_icons.items():
+                        icons["segment"][k] = cls.image(v)
+                        if invert:
+                            enhancer = ImageEnhance.Brightness(icons["segment"][k])
+                            icons["segment"][k] = enhancer.enhance(0.1)
+
+                    cls._icon_sets[key] = icons
+        return icons
+
+    @classmethod
+    def obstacle_icons(cls) -> dict[int, Image.Image]:
+        if cls._obstacle_icons is None:
+            with cls._lock:
+                if cls._obstacle_icons is None:
+                    cls._obstacle_icons = {k: cls.image(v) for k, v in OBSTACLE_TYPE_TO_ICON.items()}
+        return cls._obstacle_icons
+
+    @classmethod
+    def default_map_image(cls) -> Image.Image:
+        if cls._default_map_image is None:
+            with cls._lock:
+                if cls._default_map_image is None:
+                    default_map_image = cls.image(DEFAULT_MAP_IMAGE)
+                    cls._default_map_image = ImageOps.expand(
+                        default_map_image.resize(
+                            (
+                                int(default_map_image.size[0] * 0.8),
+                                int(default_map_image.size[1] * 0.8),
+                            )
+                        ),
+                        border=(50, 75, 50, 75),
+                    )
+        return cls._default_map_image
+
+    @classmethod
+    def font_file(cls) -> bytes:
+        if cls._font_file is None:
+            with cls._lock:
+                if cls._font_file is None:
+                    cls._font_file = zlib.decompress(base64.b64decode(MAP_FONT), zlib.MAX_WBITS | 32)
+        return cls._font_file
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def font(size: int) -> ImageFont.FreeTypeFont:
+        return ImageFont.truetype(BytesIO(DreameVacuumMapRendererResources.font_file()), size)
+
+
 class DreameVacuumMapDataRenderer:
     HALF_INT16 = 32768
     HALF_INT16_UPPER_HALF = 32767
@@ -2614,7 +3095,7 @@ class DreameVacuumMapDataRenderer:
         self._layers: dict[MapRendererLayer, dict[str, Any]] = {}
 
         self._default_map_data: str = base64.b64decode(DEFAULT_MAP_DATA)
-        self._default_map_image = Image.open(BytesIO(base64.b64decode(DEFAULT_MAP_DATA_IMAGE))).convert("RGBA")
+        self._default_map_image = DreameVacuumMapRendererResources.image(DEFAULT_MAP_DATA_IMAGE)
 
     @staticmethod
     def _coordinate_tuple_sort(a: list[int], b: list[int]) -> bool:
@@ -2648,6 +3129,11 @@ class DreameVacuumMapDataRenderer:
         image.save(buffer, format="PNG", pnginfo=info)
         return buffer.getvalue()
 
+    @property
+    def content_type(self) -> str:
+        # Map data is embedded into a PNG text chunk so output format is not configurable
+        return "image/png"
+
     def render_map(self, map_data: MapData, robot_status: int = 0) -> bytes:
         if map_data is None or map_data.empty_map:
             return self.default_map_image
@@ -2655,7 +3141,7 @@ class DreameVacuumMapDataRenderer:
         if (
             self._map_data
             and self._map_data == map_data
-            and self._map_data.segments == map_data.segments
+            and self._map_data.segment_fingerprint == map_data.segment_fingerprint
             and self._map_data.frame_id == map_data.frame_id
             and self._map_data_json
         ):
@@ -2843,35 +3329,30 @@ class DreameVacuumMapDataRenderer:
 
         if (
             self._map_data is None
-            or len(self._map_data.path) != len(map_data.path)
+            or self._map_data.path_fingerprint != map_data.path_fingerprint
             or not self._layers.get(MapRendererLayer.PATH)
         ):
-            points = []
             self._layers[MapRendererLayer.PATH] = []
+            groups = [[]]
             if map_data.path and len(map_data.path) > 1:
-                s = map_data.path[0]
-                for point in map_data.path[1:]:
-                    if point.path_type == PathType.LINE:
-                        point = point
-                        a = DreameVacuumMapDataRenderer._convert_coordinates(s.x, s.y)
-                        b = DreameVacuumMapDataRenderer._convert_coordinates(point.x, point.y)
-
-                        points.extend([a[0], a[1], b[0], b[1]])
-                    else:
-                        self._layers[MapRendererLayer.PATH].append(
-                            {
-                                MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
-                                MAP_DATA_PARAMETER_POINTS: points,
-                            }
-                        )
-                        points = []
-                    s = point
-            self._layers[MapRendererLayer.PATH].append(
-                {
-                    MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
-                    MAP_DATA_PARAMETER_POINTS: points,
-                }
-            )
+                x = np.round((map_data.path.x + DreameVacuumMapDataRenderer.HALF_INT16) / 10).astype(np.int64)
+                y = DreameVacuumMapDataRenderer.MAX - np.round(
+                    (map_data.path.y + DreameVacuumMapDataRenderer.HALF_INT16) / 10
+                ).astype(np.int64)
+                # Every line point is connected to the previous point, other types start a new path
+                lines = np.column_stack((x[:-1], y[:-1], x[1:], y[1:]))
+                breaks = np.flatnonzero(map_data.path.path_type[1:] != MapPath.LINE)
+                groups = [lines[: breaks[0]] if len(breaks) else lines] + [
+                    lines[start + 1 : end] for start, end in zip(breaks, [*breaks[1:], len(lines)])
+                ]
+
+            for points in groups:
+                self._layers[MapRendererLayer.PATH].append(
+                    {
+                        MAP_DATA_PARAMETER_TYPE: MAP_DATA_PARAMETER_PATH,
+                        MAP_DATA_PARAMETER_POINTS: np.ravel(points).tolist(),
+                    }
+                )
         map_data_json[MAP_DATA_PARAMETER_ENTITIES].extend(self._layers[MapRendererLayer.PATH])
 
         floor_pixels = []
@@ -2882,8 +3363,8 @@ class DreameVacuumMapDataRenderer:
             self._map_data is None
             or self._map_data.active_segments != map_data.active_segments
             or self._map_data.active_areas != map_data.active_areas
-            or self._map_data.segments != map_data.segments
-            or self._map_data.data != map_data.data
+            or self._map_data.segment_fingerprint != map_data.segment_fingerprint
+            or self._map_data.pixel_fingerprint != map_data.pixel_fingerprint
             or not self._layers.get(MapRendererLayer.IMAGE)
         ):
             self._layers[MapRendererLayer.IMAGE] = []
@@ -3090,15 +3571,20 @@ class DreameVacuumMapDataRenderer:
 
 
 class DreameVacuumMapRenderer:
+    _icon_color_cache: dict[tuple, tuple[Image.Image, Image.Image]] = {}
+    _icon_color_cache_lock: RLock = RLock()
+
     def __init__(
         self,
         color_scheme: str = None,
         icon_set: str = None,
         hidden_map_objects: list[str] = None,
         robot_shape: int = 0,
+        image_format: str = None,
     ) -> None:
         self.color_scheme: MapRendererColorScheme = MAP_COLOR_SCHEME_LIST.get(color_scheme, MapRendererColorScheme())
         self.icon_set: int = MAP_ICON_SET_LIST.get(icon_set, 0)
+        self.image_format: MapRendererImageFormat = MAP_IMAGE_FORMAT_LIST.get(image_format, MapRendererImageFormat())
         self.config: MapRendererConfig = MapRendererConfig()
         if hidden_map_objects is not None:
             for attr in self.config.__dict__.keys():
@@ -3136,83 +3622,59 @@ class DreameVacuumMapRenderer:
         self._robot_washing_icon = None
         self._robot_cleaning_direction_icon = None
         self._obstacle_background = None
+        self._obstacle_sprites: dict[tuple[int, int], Image.Image] = {}
+        self._sprite_cache: dict[tuple, Image.Image] = {}
 
-        default_map_image = Image.open(BytesIO(base64.b64decode(DEFAULT_MAP_IMAGE))).convert("RGBA")
-        self._default_map_image = ImageOps.expand(
-            default_map_image.resize(
-                (
-                    int(default_map_image.size[0] * 0.8),
-                    int(default_map_image.size[1] * 0.8),
-                )
-            ),
-            border=(50, 75, 50, 75),
-        )
-
-        icon_set = SEGMENT_ICONS_DREAME
-        repeats = MAP_ICON_REPEATS_DREAME
-        suction_level = MAP_ICON_SUCTION_LEVEL_DREAME
-        water_volume = MAP_ICON_WATER_VOLUME_DREAME
-        cleaning_mode = MAP_ICON_CLEANING_MODE_DREAME
-
-        self._segment_icons = {}
-        if self.icon_set == 1:
-            icon_set = SEGMENT_ICONS_DREAME_OLD
-        elif self.icon_set == 2:
-            icon_set = SEGMENT_ICONS_MIJIA
-            repeats = MAP_ICON_REPEATS_MIJIA
-            suction_level = MAP_ICON_SUCTION_LEVEL_MIJIA
-            water_volume = MAP_ICON_WATER_VOLUME_MIJIA
-            cleaning_mode = MAP_ICON_CLEANING_MODE_MIJIA
-        elif self.icon_set == 3:
-            icon_set = SEGMENT_ICONS_MATERIAL
-            repeats = MAP_ICON_REPEATS_MATERIAL
-            suction_level = MAP_ICON_SUCTION_LEVEL_MATERIAL
-            water_volume = MAP_ICON_WATER_VOLUME_MATERIAL
-            cleaning_mode = MAP_ICON_CLEANING_MODE_MATERIAL
-
-        self._cleaning_times_icon = [Image.open(BytesIO(base64.b64decode(icon))).convert("RGBA") for icon in repeats]
-        self._suction_level_icon = [
-            Image.open(BytesIO(base64.b64decode(icon))).convert("RGBA") for icon in suction_level
-        ]
-        self._water_volume_icon = [
-            Image.open(BytesIO(base64.b64decode(icon))).convert("RGBA") for icon in water_volume
-        ]
-        self._cleaning_mode_icon = [
-            Image.open(BytesIO(base64.b64decode(icon))).convert("RGBA") for icon in cleaning_mode
-        ]
-
-        for k, v in icon_set.items():
-            self._segment_icons[k] = Image.open(BytesIO(base64.b64decode(v))).convert("RGBA")
-            if self.color_scheme.invert:
-                enhancer = ImageEnhance.Brightness(self._segment_icons[k])
-                self._segment_icons[k] = enhancer.enhance(0.1)
-
-        self._obstacle_icons = {}
-        for k, v in OBSTACLE_TYPE_TO_ICON.items():
-            self._obstacle_icons[k] = Image.open(BytesIO(base64.b64decode(v))).convert("RGBA")
+        self._default_map_image = DreameVacuumMapRendererResources.default_map_image()
 
-        self.font_file = zlib.decompress(base64.b64decode(MAP_FONT), zlib.MAX_WBITS | 32)
+        icons = DreameVacuumMapRendererResources.icon_set(self.icon_set, self.color_scheme.invert)
+        self._segment_icons = icons["segment"]
+        self._cleaning_times_icon = icons["cleaning_times"]
+        self._suction_level_icon = icons["suction_level"]
+        self._water_volume_icon = icons["water_volume"]
+        self._cleaning_mode_icon = icons["cleaning_mode"]
+        self._obstacle_icons = DreameVacuumMapRendererResources.obstacle_icons()
+        self.font_file = DreameVacuumMapRendererResources.font_file()
 
-    @staticmethod
-    def _to_buffer(image) -> bytes:
+    def _to_buffer(self, image) -> bytes:
         if image:
+            if not self.image_format.alpha and image.mode == "RGBA":
+                # Formats without alpha channel support are flattened on to the background color of the color scheme
+                background = Image.new("RGB", image.size, (0, 0, 0) if self.color_scheme.dark else (255, 255, 255))
+                background.paste(image, mask=image.split()[3])
+                image = background
             buffer = io.BytesIO()
-            image.save(buffer, format="PNG")
+            image.save(buffer, format=self.image_format.format, **self.image_format.save_params)
             return buffer.getvalue()
 
+    @property
+    def content_type(self) -> str:
+        return self.image_format.content_type
+
+    def _cache_sprite(self, key: tuple, sprite) -> None:
+        if len(self._sprite_cache) >= 256:
+            # Drop the oldest sprite, labels only change when a segment is renamed or map is rotated
+            del self._sprite_cache[next(iter(self._sprite_cache))]
+        self._sprite_cache[key] = sprite
+
     @staticmethod
     def _set_icon_color(image, size, color):
-        ico = image.resize((int(size), int(size)))
-        pixdata = ico.load()
-        for yy in range(ico.size[1]):
-            for xx in range(ico.size[0]):
-                if (
-                    pixdata[xx, yy][0] > 80
-                    and pixdata[xx, yy][1] > 80
-                    and pixdata[xx, yy][2] > 80
-                    and pixdata[xx, yy][3] > 80
-                ):
-                    pixdata[xx, yy] = color
+        key = (id(image), int(size), tuple(color))
+        with DreameVacuumMapRenderer._icon_color_cache_lock:
+            cached = DreameVacuumMapRenderer._icon_color_cache.get(key)
+        # Source image is stored with the result so its id cannot be reused by another image while it is cached
+        if cached is not None and cached[0] is image:
+            return cached[1]
+
+        pixels = np.array(image.resize((int(size), int(size))))
+        pixels[(pixels > 80).all(axis=2)] = color if len(color) == 4 else (*color, 255)
+        ico = Image.fromarray(pixels, "RGBA")
+
+        # Cache is shared by the renderers of all devices and they render on different threads
+        with DreameVacuumMapRenderer._icon_color_cache_lock:
+            if len(DreameVacuumMapRenderer._icon_color_cache) >= 512:
+                del DreameVacuumMapRenderer._icon_color_cache[next(iter(DreameVacuumMapRenderer._icon_color_cache))]
+            DreameVacuumMapRenderer._icon_color_cache[key] = (image, ico)
 
         return ico
 
@@ -3349,14 +3811,16 @@ class DreameVacuumMapRenderer:
                 or self._map_data.dimensions != map_data.dimensions
                 or self._map_data.map_id != map_data.map_id
                 or self._map_data.saved_map_status != map_data.saved_map_status
+                or self._map_data.rotation != map_data.rotation
             ):
+                # All layers are rendered in rotated image space and needs to be redrawn when rotation is changed
                 self._map_data = None
 
             if (
                 self._map_data
                 and self._map_data == map_data
                 and self._robot_status == robot_status
-                and self._map_data.segments == map_data.segments
+                and self._map_data.segment_fingerprint == map_data.segment_fingerprint
                 and self._map_data.frame_id == map_data.frame_id
                 and self._image
             ):
@@ -3369,7 +3833,7 @@ class DreameVacuumMapRenderer:
             if not map_data.saved_map:
                 if (
                     self._map_data is None
-                    or self._map_data.segments != map_data.segments
+                    or self._map_data.segment_fingerprint != map_data.segment_fingerprint
                     or self._map_data.dimensions != map_data.dimensions
                 ):
                     map_data.dimensions.bounds = DreameVacuumMapRenderer._calculate_bounds(
@@ -3387,7 +3851,7 @@ class DreameVacuumMapRenderer:
                 or self._map_data.no_mopping_areas != map_data.no_mopping_areas
                 or self._map_data.no_go_areas != map_data.no_go_areas
                 or self._map_data.walls != map_data.walls
-                or self._map_data.segments != map_data.segments
+                or self._map_data.segment_fingerprint != map_data.segment_fingerprint
                 or self._map_data.dimensions != map_data.dimensions
                 or self._map_data.restored_map != map_data.restored_map
             ):
@@ -3414,26 +3878,24 @@ class DreameVacuumMapRenderer:
             if self._map_data and self._map_data.dimensions.scale != scale:
                 self._map_data = None
 
-            if self._map_data is None or self._map_data.rotation != map_data.rotation:
+            if self._map_data is None:
                 self._charger_icon = None
                 self._robot_sleeping_icon = None
                 self._obstacle_background = None
-
-                if self._map_data is None:
-                    self._robot_icon = None
-                    self._robot_charging_icon = None
-                    self._robot_cleaning_icon = None
-                    self._robot_warning_icon = None
-                    self._robot_washing_icon = None
-                    self._robot_cleaning_direction_icon = None
+                self._robot_icon = None
+                self._robot_charging_icon = None
+                self._robot_cleaning_icon = None
+                self._robot_warning_icon = None
+                self._robot_washing_icon = None
+                self._robot_cleaning_direction_icon = None
 
             if (
                 self._map_data is None
                 or not self._layers.get(MapRendererLayer.IMAGE)
                 or self._map_data.active_segments != map_data.active_segments
                 or self._map_data.active_areas != map_data.active_areas
-                or self._map_data.segments != map_data.segments
-                or self._map_data.data != map_data.data
+                or self._map_data.segment_fingerprint != map_data.segment_fingerprint
+                or self._map_data.pixel_fingerprint != map_data.pixel_fingerprint
             ):
                 area_colors = {}
                 # as implemented on the app
@@ -3455,34 +3917,24 @@ class DreameVacuumMapRenderer:
                         else:
                             area_colors[k] = area_colors[MapPixelType.FLOOR.value]
 
-                pixels = np.full(
-                    (
-                        map_data.dimensions.height,
-                        map_data.dimensions.width,
-                        4,
-                    ),
-                    area_colors[MapPixelType.OUTSIDE.value],
-                    dtype=np.uint8,
-                )
+                # Pixel types are used as palette indexes, base image is built with one byte per pixel
+                palette = []
+                for px_type in range(256):
+                    palette.extend(area_colors.get(px_type, area_colors[MapPixelType.NEW_SEGMENT.value]))
+
+                pixels = np.flipud(np.asarray(map_data.pixel_type, dtype=np.uint8).T)
 
                 min_x = map_data.dimensions.width - 1
                 min_y = map_data.dimensions.height - 1
                 max_x = 0
                 max_y = 0
-                for y in range(map_data.dimensions.height):
-                    for x in range(map_data.dimensions.width):
-                        px_type = int(map_data.pixel_type[x, map_data.dimensions.height - y - 1])
-                        if px_type != MapPixelType.OUTSIDE.value:
-                            pixels[y, x] = (
-                                area_colors[px_type]
-                                if px_type in area_colors
-                                else area_colors[MapPixelType.NEW_SEGMENT.value]
-                            )
-
-                            max_x = max(x, max_x)
-                            min_x = min(x, min_x)
-                            max_y = max(y, max_y)
-                            min_y = min(y, min_y)
+                rows = np.flatnonzero(pixels.any(axis=1))
+                if rows.size:
+                    columns = np.flatnonzero(pixels.any(axis=0))
+                    min_x = min(int(columns[0]), min_x)
+                    max_x = int(columns[-1])
+                    min_y = min(int(rows[0]), min_y)
+                    max_y = int(rows[-1])
 
                 if map_data.dimensions.bounds:
                     # min_x = max(0, min(map_data.dimensions.bounds[0], min_x))
@@ -3516,10 +3968,25 @@ class DreameVacuumMapRenderer:
                 if self._map_data and self._map_data.dimensions.crop != map_data.dimensions.crop:
                     self._map_data = None
 
-                self._layers[MapRendererLayer.IMAGE] = ImageOps.expand(
-                    Image.fromarray(pixels.repeat(scale, axis=0).repeat(scale, axis=1)),
-                    border=tuple(map_data.dimensions.padding),
+                image = Image.fromarray(np.ascontiguousarray(pixels), "P")
+                image.putpalette(palette, "RGBA")
+                padding = map_data.dimensions.padding
+                scaled = image.resize((image.size[0] * scale, image.size[1] * scale), Image.Resampling.NEAREST)
+                image = Image.new(
+                    "RGBA",
+                    (scaled.size[0] + padding[0] + padding[2], scaled.size[1] + padding[1] + padding[3]),
+                    (0, 0, 0, 0),
                 )
+                image.paste(scaled.convert("RGBA"), (padding[0], padding[1]))
+
+                # Rotation is baked into the base layer once and objects are drawn directly on rotated coordinates
+                if map_data.rotation == 90:
+                    image = image.transpose(Image.ROTATE_90)
+                elif map_data.rotation == 180:
+                    image = image.transpose(Image.ROTATE_180)
+                elif map_data.rotation == 270:
+                    image = image.transpose(Image.ROTATE_270)
+                self._layers[MapRendererLayer.IMAGE] = image
             else:
                 map_data.dimensions.crop = self._map_data.dimensions.crop
 
@@ -3532,13 +3999,6 @@ class DreameVacuumMapRenderer:
                 2,
             )
 
-            if map_data.rotation == 90:
-                image = image.transpose(Image.ROTATE_90)
-            elif map_data.rotation == 180:
-                image = image.transpose(Image.ROTATE_180)
-            elif map_data.rotation == 270:
-                image = image.transpose(Image.ROTATE_270)
-
             _LOGGER.info("Render frame: %s:%s took: %.2f", map_data.map_id, map_data.frame_id, time.time() - now)
 
             self._map_data = map_data
@@ -3600,7 +4060,7 @@ class DreameVacuumMapRenderer:
         if map_data.path and self.config.path:
             if (
                 self._map_data is None
-                or self._map_data.path != map_data.path
+                or self._map_data.path_fingerprint != map_data.path_fingerprint
                 or not self._layers.get(MapRendererLayer.PATH)
             ):
                 self._layers[MapRendererLayer.PATH] = self.render_path(
@@ -3609,6 +4069,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     line_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.PATH])
@@ -3626,6 +4087,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     border_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.NO_MOP])
@@ -3643,6 +4105,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     border_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.NO_GO])
@@ -3659,6 +4122,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     line_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.WALL])
@@ -3676,6 +4140,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     border_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.ACTIVE_AREA])
@@ -3693,6 +4158,7 @@ class DreameVacuumMapRenderer:
                     layer,
                     map_data.dimensions,
                     border_width,
+                    map_data.rotation,
                     scale,
                 )
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.ACTIVE_POINT])
@@ -3708,7 +4174,7 @@ class DreameVacuumMapRenderer:
         ):
             if (
                 self._map_data is None
-                or self._map_data.segments != map_data.segments
+                or self._map_data.segment_fingerprint != map_data.segment_fingerprint
                 or self._map_data.rotation != map_data.rotation
                 or bool(self._map_data.cleanset) != bool(map_data.cleanset)
                 or not self._layers.get(MapRendererLayer.SEGMENTS)
@@ -3966,13 +4432,30 @@ class DreameVacuumMapRenderer:
                 or self._map_data.rotation != map_data.rotation
                 or not self._layers.get(MapRendererLayer.OBSTACLES)
             ):
+                obstacle_layer = None
+                obstacles = map_data.obstacles
+                previous_obstacles = self._map_data.obstacles if self._map_data else None
+                if (
+                    previous_obstacles
+                    and self._layers.get(MapRendererLayer.OBSTACLES)
+                    and self._map_data.rotation == map_data.rotation
+                    and len(obstacles) > len(previous_obstacles)
+                    and all(
+                        a == b and a.obstacle_type == b.obstacle_type for a, b in zip(previous_obstacles, obstacles)
+                    )
+                ):
+                    # Obstacles are only appended while cleaning, draw new ones on top of the existing layer
+                    obstacle_layer = self._layers[MapRendererLayer.OBSTACLES]
+                    obstacles = obstacles[len(previous_obstacles) :]
+
                 self._layers[MapRendererLayer.OBSTACLES] = self.render_obstacles(
-                    map_data.obstacles,
+                    obstacles,
                     layer,
                     map_data.dimensions,
                     int((icon_size * 2) * map_data.dimensions.scale),
                     map_data.rotation,
                     scale,
+                    obstacle_layer,
                 )
 
             layer = Image.alpha_composite(layer, self._layers[MapRendererLayer.OBSTACLES])
@@ -3985,25 +4468,30 @@ class DreameVacuumMapRenderer:
             layer,
         )
 
-    def render_areas(self, areas, color, fill, layer, dimensions, width, scale):
+    @staticmethod
+    def _to_img(point: Point, dimensions: MapImageDimensions, rotation: int) -> Point:
+        p = point.to_img(dimensions)
+        if rotation:
+            return p.rotated(dimensions, rotation)
+        return p
+
+    @staticmethod
+    def _area_to_img(area: Area, dimensions: MapImageDimensions, rotation: int, scale: int) -> list[float]:
+        coords = []
+        for x, y in [(area.x0, area.y0), (area.x1, area.y1), (area.x2, area.y2), (area.x3, area.y3)]:
+            p = DreameVacuumMapRenderer._to_img(Point(x, y), dimensions, rotation)
+            coords.extend([p.x * scale, p.y * scale])
+        return coords
+
+    def render_areas(self, areas, color, fill, layer, dimensions, width, rotation, scale):
         new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(new_layer, "RGBA")
         for area in areas:
-            p = area.to_img(dimensions)
-            coords = [
-                p.x0 * scale,
-                p.y0 * scale,
-                p.x1 * scale,
-                p.y1 * scale,
-                p.x2 * scale,
-                p.y2 * scale,
-                p.x3 * scale,
-                p.y3 * scale,
-            ]
+            coords = DreameVacuumMapRenderer._area_to_img(area, dimensions, rotation, scale)
             draw.polygon(coords, fill, color, width=(width * scale))
         return new_layer
 
-    def render_points(self, points, color, fill, layer, dimensions, width, scale):
+    def render_points(self, points, color, fill, layer, dimensions, width, rotation, scale):
         new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(new_layer, "RGBA")
         size = 15 * dimensions.grid_size
@@ -4019,73 +4507,70 @@ class DreameVacuumMapRenderer:
                 point.y + size,
             )
 
-            p = area.to_img(dimensions)
-            coords = [
-                p.x0 * scale,
-                p.y0 * scale,
-                p.x1 * scale,
-                p.y1 * scale,
-                p.x2 * scale,
-                p.y2 * scale,
-                p.x3 * scale,
-                p.y3 * scale,
-            ]
+            coords = DreameVacuumMapRenderer._area_to_img(area, dimensions, rotation, scale)
             draw.polygon(coords, fill, color, width=(width * scale))
         return new_layer
 
-    def render_walls(self, walls, color, layer, dimensions, width, scale):
+    def render_walls(self, walls, color, layer, dimensions, width, rotation, scale):
         new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(new_layer, "RGBA")
         for wall in walls:
-            p = wall.to_img(dimensions)
+            p0 = DreameVacuumMapRenderer._to_img(Point(wall.x0, wall.y0), dimensions, rotation)
+            p1 = DreameVacuumMapRenderer._to_img(Point(wall.x1, wall.y1), dimensions, rotation)
             draw.line(
-                [p.x0 * scale, p.y0 * scale, p.x1 * scale, p.y1 * scale],
+                [p0.x * scale, p0.y * scale, p1.x * scale, p1.y * scale],
                 color,
                 width=(width * scale),
             )
         return new_layer
 
-    def render_path(self, path, color, layer, dimensions, width, scale):
+    @staticmethod
+    def _path_to_img(path: MapPath, dimensions: MapImageDimensions, rotation: int, scale: int) -> np.ndarray:
+        x = ((path.x - dimensions.left) / dimensions.grid_size) * dimensions.scale + dimensions.padding[0]
+        x = x - dimensions.crop[0]
+        y = (((dimensions.height - 1) * dimensions.grid_size - (path.y - dimensions.top)) / dimensions.grid_size) * (
+            dimensions.scale
+        )
+        y = y + dimensions.padding[1] - dimensions.crop[1]
+        if rotation:
+            w = int(
+                (dimensions.width * dimensions.scale)
+                + dimensions.padding[0]
+                + dimensions.padding[2]
+                - dimensions.crop[0]
+                - dimensions.crop[2]
+            )
+            h = int(
+                (dimensions.height * dimensions.scale)
+                + dimensions.padding[1]
+                + dimensions.padding[3]
+                - dimensions.crop[1]
+                - dimensions.crop[3]
+            )
+            while rotation > 0:
+                x, y = y, w - x
+                w, h = h, w
+                rotation = rotation - 90
+        return np.column_stack((x * scale, y * scale))
+
+    def render_path(self, path, color, layer, dimensions, width, rotation, scale):
         new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(new_layer, "RGBA")
         sweep = []
         mop = []
-        sweep_path = []
-        mop_path = []
-        path_type = ""
-
-        for point in path:
-            p = point.to_img(dimensions)
-            if point.path_type == PathType.LINE:
-                l = [p.x * scale, p.y * scale]
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.SWEEP:
-                    sweep_path.extend(l)
-
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP:
-                    mop_path.extend(l)
-            else:
-                if mop_path:
-                    mop.append(mop_path)
-
-                if sweep_path:
-                    sweep.append(sweep_path)
-
-                path_type = point.path_type
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.SWEEP:
-                    sweep_path = [p.x * scale, p.y * scale]
-                else:
-                    sweep_path = []
-
-                if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP:
-                    mop_path = [p.x * scale, p.y * scale]
-                else:
-                    mop_path = []
 
-        if sweep_path:
-            sweep.append(sweep_path)
+        coords = DreameVacuumMapRenderer._path_to_img(path, dimensions, rotation, scale)
+        path_types = path.path_type
+        starts = np.flatnonzero(path_types != MapPath.LINE)
+        # Points before the first move operation do not belong to a path
+        for start, end in zip(starts.tolist(), [*starts[1:].tolist(), len(path)]):
+            path_type = PathType(chr(path_types[start]))
+            points = coords[start:end].ravel().tolist()
+            if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.SWEEP:
+                sweep.append(points)
 
-        if mop_path:
-            mop.append(mop_path)
+            if path_type == PathType.SWEEP_AND_MOP or path_type == PathType.MOP:
+                mop.append(points)
 
         for path in mop:
             size = width * scale * 12
@@ -4143,10 +4628,8 @@ class DreameVacuumMapRenderer:
                 else:
                     charger_image = MAP_CHARGER_IMAGE_DREAME
 
-            self._charger_icon = (
-                Image.open(BytesIO(base64.b64decode(charger_image)))
-                .convert("RGBA")
-                .resize((icon_size, icon_size), resample=Image.Resampling.NEAREST)
+            self._charger_icon = DreameVacuumMapRendererResources.image(charger_image).resize(
+                (icon_size, icon_size), resample=Image.Resampling.NEAREST
             )
 
             if self.icon_set == 3:
@@ -4160,16 +4643,11 @@ class DreameVacuumMapRenderer:
                 enhancer = ImageEnhance.Brightness(self._charger_icon)
                 self._charger_icon = enhancer.enhance(0.7)
 
-        charger_icon = self._charger_icon.rotate(
-            (
-                charger_position.a
-                if self._robot_shape == 1 or self.icon_set == 2 or self.icon_set == 3
-                else (-map_rotation)
-            ),
-            expand=1,
-        )
+        charger_icon = self._charger_icon
+        if self._robot_shape == 1 or self.icon_set == 2 or self.icon_set == 3:
+            charger_icon = charger_icon.rotate(charger_position.a + map_rotation, expand=1)
 
-        point = charger_position.to_img(dimensions)
+        point = DreameVacuumMapRenderer._to_img(charger_position, dimensions, map_rotation)
         new_layer.paste(
             charger_icon,
             (int((point.x * scale) - (charger_icon.size[0] / 2)), int((point.y * scale) - (charger_icon.size[1] / 2))),
@@ -4178,11 +4656,8 @@ class DreameVacuumMapRenderer:
 
         if robot_status > 5:
             if self._robot_washing_icon is None:
-                self._robot_washing_icon = (
-                    Image.open(BytesIO(base64.b64decode(MAP_ROBOT_WASHING_IMAGE)))
-                    .convert("RGBA")
-                    .resize((int(icon_size * 1.25), int(icon_size * 1.25)), resample=Image.Resampling.NEAREST)
-                    .rotate(-map_rotation)
+                self._robot_washing_icon = DreameVacuumMapRendererResources.image(MAP_ROBOT_WASHING_IMAGE).resize(
+                    (int(icon_size * 1.25), int(icon_size * 1.25)), resample=Image.Resampling.NEAREST
                 )
                 enhancer = ImageEnhance.Brightness(self._robot_washing_icon)
                 if self.color_scheme.dark:
@@ -4191,16 +4666,7 @@ class DreameVacuumMapRenderer:
             icon = self._robot_washing_icon
 
             icon_x = point.x * scale
-            icon_y = point.y * scale
-            offset = icon_size * 1.5
-            if map_rotation == 90:
-                icon_x = icon_x + offset
-            elif map_rotation == 180:
-                icon_y = icon_y + offset
-            elif map_rotation == 270:
-                icon_x = icon_x - offset
-            else:
-                icon_y = icon_y - offset
+            icon_y = point.y * scale - (icon_size * 1.5)
 
             new_layer.paste(
                 icon,
@@ -4236,10 +4702,8 @@ class DreameVacuumMapRenderer:
                     else:
                         robot_image = MAP_ROBOT_LIDAR_IMAGE_DREAME_DARK
 
-            self._robot_icon = (
-                Image.open(BytesIO(base64.b64decode(robot_image)))
-                .convert("RGBA")
-                .resize((robot_icon_size, robot_icon_size), resample=Image.Resampling.NEAREST)
+            self._robot_icon = DreameVacuumMapRendererResources.image(robot_image).resize(
+                (robot_icon_size, robot_icon_size), resample=Image.Resampling.NEAREST
             )
 
             if self._robot_shape != 2 and self.icon_set != 2 and self.icon_set != 3:
@@ -4249,32 +4713,29 @@ class DreameVacuumMapRenderer:
                 else:
                     self._robot_icon = enhancer.enhance(0.9)
 
-        icon = self._robot_icon.rotate(robot_position.a)
-        point = robot_position.to_img(dimensions)
+        angle = robot_position.a + map_rotation
+        icon = self._robot_icon.rotate(angle)
+        point = DreameVacuumMapRenderer._to_img(robot_position, dimensions, map_rotation)
 
         status_icon = None
         if robot_status == 1:
             if self._robot_cleaning_icon is None:
-                self._robot_cleaning_icon = (
-                    Image.open(BytesIO(base64.b64decode(MAP_ROBOT_CLEANING_IMAGE)))
-                    .convert("RGBA")
-                    .resize(((int(icon_size * 1.25), int(icon_size * 1.25))), resample=Image.Resampling.NEAREST)
+                self._robot_cleaning_icon = DreameVacuumMapRendererResources.image(MAP_ROBOT_CLEANING_IMAGE).resize(
+                    ((int(icon_size * 1.25), int(icon_size * 1.25))), resample=Image.Resampling.NEAREST
                 )
             status_icon = self._robot_cleaning_icon
 
             if self.config.cleaning_direction:
                 if self._robot_cleaning_direction_icon is None:
-                    self._robot_cleaning_direction_icon = (
-                        Image.open(BytesIO(base64.b64decode(MAP_ROBOT_CLEANING_DIRECTION_IMAGE)))
-                        .convert("RGBA")
-                        .resize(((int(icon_size * 1.5), int(icon_size * 1.5))), resample=Image.Resampling.NEAREST)
-                    )
+                    self._robot_cleaning_direction_icon = DreameVacuumMapRendererResources.image(
+                        MAP_ROBOT_CLEANING_DIRECTION_IMAGE
+                    ).resize(((int(icon_size * 1.5), int(icon_size * 1.5))), resample=Image.Resampling.NEAREST)
 
-                ico = self._robot_cleaning_direction_icon.rotate(robot_position.a, expand=1)
+                ico = self._robot_cleaning_direction_icon.rotate(angle, expand=1)
 
                 offset = int(icon_size / 2)
-                x = point.x + offset * math.cos(-robot_position.a * math.pi / 180)
-                y = point.y + offset * math.sin(-robot_position.a * math.pi / 180)
+                x = point.x + offset * math.cos(-angle * math.pi / 180)
+                y = point.y + offset * math.sin(-angle * math.pi / 180)
                 new_layer.paste(
                     ico,
                     (
@@ -4284,18 +4745,14 @@ class DreameVacuumMapRenderer:
                 )
         elif robot_status == 2:
             if self._robot_charging_icon is None:
-                self._robot_charging_icon = (
-                    Image.open(BytesIO(base64.b64decode(MAP_ROBOT_CHARGING_IMAGE)))
-                    .convert("RGBA")
-                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST)
+                self._robot_charging_icon = DreameVacuumMapRendererResources.image(MAP_ROBOT_CHARGING_IMAGE).resize(
+                    ((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST
                 )
             status_icon = self._robot_charging_icon
         elif robot_status == 3 or robot_status == 5 or robot_status == 6:
             if self._robot_warning_icon is None:
-                self._robot_warning_icon = (
-                    Image.open(BytesIO(base64.b64decode(MAP_ROBOT_WARNING_IMAGE)))
-                    .convert("RGBA")
-                    .resize(((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST)
+                self._robot_warning_icon = DreameVacuumMapRendererResources.image(MAP_ROBOT_WARNING_IMAGE).resize(
+                    ((int(icon_size * 1.3), int(icon_size * 1.3))), resample=Image.Resampling.NEAREST
                 )
             status_icon = self._robot_warning_icon
 
@@ -4323,11 +4780,7 @@ class DreameVacuumMapRenderer:
 
         if robot_status == 4 or robot_status == 5:
             if self._robot_sleeping_icon is None:
-                sleeping_icon = (
-                    Image.open(BytesIO(base64.b64decode(MAP_ROBOT_SLEEPING_IMAGE)))
-                    .convert("RGBA")
-                    .rotate(-map_rotation, expand=1)
-                )
+                sleeping_icon = DreameVacuumMapRendererResources.image(MAP_ROBOT_SLEEPING_IMAGE)
                 enhancer = ImageEnhance.Brightness(sleeping_icon)
                 if not self.color_scheme.dark:
                     sleeping_icon = enhancer.enhance(0.7)
@@ -4346,18 +4799,8 @@ class DreameVacuumMapRenderer:
                 [int(icon_size * 0.43), int(icon_size * 0.43), 1],
             ]:
                 status_icon = self._robot_sleeping_icon[k[2]]
-                if map_rotation == 90:
-                    x = point.x + k[1]
-                    y = point.y + k[0]
-                elif map_rotation == 180:
-                    x = point.x - k[0]
-                    y = point.y + k[1]
-                elif map_rotation == 270:
-                    x = point.x - k[1]
-                    y = point.y - k[0]
-                else:
-                    x = point.x + k[0]
-                    y = point.y - k[1]
+                x = point.x + k[0]
+                y = point.y - k[1]
 
                 new_layer.paste(
                     status_icon,
@@ -4387,15 +4830,14 @@ class DreameVacuumMapRenderer:
             text_font = None
             order_font = None
             if text and self.config.name:
-                text_font = ImageFont.truetype(
-                    BytesIO(self.font_file),
-                    int((size * 1.9)) if segment.index or icon is None else int((size * 1.7)),
+                text_font = DreameVacuumMapRendererResources.font(
+                    int((size * 1.9)) if segment.index or icon is None else int((size * 1.7))
                 )
 
             if segment.order and self.config.order:
-                order_font = ImageFont.truetype(BytesIO(self.font_file), int((size * 2.1)))
+                order_font = DreameVacuumMapRendererResources.font(int((size * 2.1)))
 
-            p = Point(segment.x, segment.y).to_img(dimensions)
+            p = DreameVacuumMapRenderer._to_img(Point(segment.x, segment.y), dimensions, rotation)
             x = p.x
             y = p.y
 
@@ -4428,30 +4870,11 @@ class DreameVacuumMapRenderer:
                             text_offset = 0
                             padding = -(icon_size / 4)
 
-                        if rotation == 90 or rotation == 270:
-                            y0 = y0 - ws - padding
-                            y1 = y1 + ws + padding
-
-                            if rotation == 90:
-                                ty = (y - ws + text_offset) * scale
-                                tx = (x - (th / 4)) * scale
-                                y = y - ws - icon_offset
-                            else:
-                                ty = (y - ws - text_offset) * scale
-                                tx = (x - (th / 4)) * scale
-                                y = y + ws + icon_offset
-                        else:
-                            x0 = x0 - ws - padding
-                            x1 = x1 + ws + padding
-
-                            if rotation == 0:
-                                tx = (x - ws + text_offset) * scale
-                                ty = (y - (th / 4)) * scale
-                                x = x - ws - icon_offset
-                            else:
-                                tx = (x - ws - text_offset) * scale
-                                ty = (y - (th / 4)) * scale
-                                x = x + ws + icon_offset
+                        x0 = x0 - ws - padding
+                        x1 = x1 + ws + padding
+                        tx = (x - ws + text_offset) * scale
+                        ty = (y - (th / 4)) * scale
+                        x = x - ws - icon_offset
 
                         if self.config.icon:
                             draw.rounded_rectangle(
@@ -4465,9 +4888,6 @@ class DreameVacuumMapRenderer:
                                 radius=((size * scale)),
                             )
 
-                        icon_text = Image.new("RGBA", (tw, th), (255, 255, 255, 0))
-                        draw_text = ImageDraw.Draw(icon_text, "RGBA")
-
                         if self.config.icon:
                             stroke_width = 1
                             text_color = self.color_scheme.text
@@ -4481,15 +4901,20 @@ class DreameVacuumMapRenderer:
                                 text_color = (15, 15, 15, 255)
                                 stroke_color = (255, 255, 255, 210)
 
-                        draw_text.text(
-                            (0, 0),
-                            text,
-                            font=text_font,
-                            fill=text_color,
-                            stroke_width=stroke_width,
-                            stroke_fill=stroke_color,
-                        )
-                        icon_text = icon_text.rotate(-rotation, expand=1)
+                        key = (text, text_font.size, tw, th, text_color, stroke_width, stroke_color)
+                        icon_text = self._sprite_cache.get(key)
+                        if icon_text is None:
+                            icon_text = Image.new("RGBA", (tw, th), (255, 255, 255, 0))
+                            draw_text = ImageDraw.Draw(icon_text, "RGBA")
+                            draw_text.text(
+                                (0, 0),
+                                text,
+                                font=text_font,
+                                fill=text_color,
+                                stroke_width=stroke_width,
+                                stroke_fill=stroke_color,
+                            )
+                            self._cache_sprite(key, icon_text)
                         new_layer.paste(icon_text, (int(tx), int(ty)), icon_text)
                     elif icon is not None:
                         draw.ellipse(
@@ -4498,8 +4923,13 @@ class DreameVacuumMapRenderer:
                         )
 
                     if icon is not None:
-                        s = icon_size * scale
-                        icon = icon.resize((int(s), int(s))).rotate(-rotation, expand=1)
+                        s = int(icon_size * scale)
+                        key = (segment.type, s)
+                        sprite = self._sprite_cache.get(key)
+                        if sprite is None:
+                            sprite = icon.resize((s, s))
+                            self._cache_sprite(key, sprite)
+                        icon = sprite
                         new_layer.paste(
                             icon, (int(x * scale - (icon.size[0] / 2)), int(y * scale - (icon.size[1] / 2))), icon
                         )
@@ -4511,21 +4941,8 @@ class DreameVacuumMapRenderer:
                 or self.config.cleaning_mode
             )
             if order_font or custom:
-                offset = size * 2.7
-                x_offset = 0
-                y_offset = -offset
-
-                if rotation == 90:
-                    y_offset = 0
-                    x_offset = offset
-                elif rotation == 180:
-                    y_offset = offset
-                elif rotation == 270:
-                    y_offset = 0
-                    x_offset = -offset
-
-                x = p.x + x_offset
-                y = p.y + y_offset
+                x = p.x
+                y = p.y - (size * 2.7)
                 cleaning_mode = (
                     None
                     if segment.cleaning_mode is None or segment.cleaning_mode < 0 or segment.cleaning_mode > 3
@@ -4723,7 +5140,6 @@ class DreameVacuumMapRenderer:
                             ico,
                         )
 
-                icon = icon.rotate(-rotation, expand=1)
                 new_layer.paste(
                     icon,
                     (
@@ -4734,43 +5150,30 @@ class DreameVacuumMapRenderer:
                 )
         return new_layer
 
-    def render_obstacles(self, obstacles, layer, dimensions, size, rotation, scale):
-        new_layer = Image.new("RGBA", layer.size, (255, 255, 255, 0))
+    def render_obstacles(self, obstacles, layer, dimensions, size, rotation, scale, obstacle_layer=None):
+        new_layer = obstacle_layer if obstacle_layer else Image.new("RGBA", layer.size, (255, 255, 255, 0))
         icon_size = size * scale * 0.85
         draw = ImageDraw.Draw(new_layer, "RGBA")
 
         if self._obstacle_background is None:
-            self._obstacle_background = (
-                Image.open(BytesIO(base64.b64decode(MAP_ICON_OBSTACLE_BG_DREAME))).convert("RGBA").rotate(-rotation)
-            )
+            self._obstacle_sprites = {}
+            self._obstacle_background = DreameVacuumMapRendererResources.image(MAP_ICON_OBSTACLE_BG_DREAME).copy()
             self._obstacle_background.thumbnail((size * scale * scale, size * scale * scale), Image.Resampling.LANCZOS)
 
         bg_size = int(round((size * scale * 0.5) / 2))
-        offset = -8 * scale
-        if rotation == 90:
-            y_offset = 0
-            x_offset = offset
-        elif rotation == 180:
-            y_offset = offset
-            x_offset = 0
-        elif rotation == 270:
-            y_offset = 0
-            x_offset = -offset
-        else:
-            x_offset = 0
-            y_offset = -offset
+        y_offset = 8 * scale
 
         for obstacle in obstacles:
             icon = self._obstacle_icons.get(obstacle.obstacle_type.value)
             if icon:
-                p = obstacle.to_img(dimensions)
+                p = DreameVacuumMapRenderer._to_img(obstacle, dimensions, rotation)
                 x = p.x
                 y = p.y
 
                 new_layer.paste(
                     self._obstacle_background,
                     (
-                        int(round(x * scale - (self._obstacle_background.size[0] / 2) + x_offset)),
+                        int(round(x * scale - (self._obstacle_background.size[0] / 2))),
                         int(round(y * scale - (self._obstacle_background.size[1] / 2) + y_offset)),
                     ),
                 )
@@ -4780,7 +5183,12 @@ class DreameVacuumMapRenderer:
                     fill=self.color_scheme.segment[0][0],
                 )
 
-                icon = icon.resize((int(icon_size), int(icon_size))).rotate(-rotation)
+                key = (obstacle.obstacle_type.value, int(icon_size))
+                sprite = self._obstacle_sprites.get(key)
+                if sprite is None:
+                    sprite = icon.resize((int(icon_size), int(icon_size)))
+                    self._obstacle_sprites[key] = sprite
+                icon = sprite
                 new_layer.paste(
                     icon, (int(round(x * scale - (icon_size / 2))), int(round(y * scale - (icon_size / 2)))), icon
                 )
@@ -4806,9 +5214,176 @@ class DreameVacuumMapRenderer:
         return self._default_calibration_points
 
 
+class DreameVacuumMapOptimizerPool:
+    """Process wide pool of JS contexts with the map optimizer script loaded, shared by the optimizers of all devices."""
+
+    POOL_SIZE = 2
+    ACQUIRE_TIMEOUT = 60
+    SOFT_MEMORY_LIMIT = 256 * 1024 * 1024
+    HARD_MEMORY_LIMIT = 512 * 1024 * 1024
+    METRICS_LOG_INTERVAL = 600
+
+    _idle: list[MiniRacer] = []
+    _contexts: int = 0
+    _warming_up: bool = False
+    _condition: Condition = Condition()
+    _stats: dict[str, float] = {"created": 0, "acquired": 0, "waited": 0, "wait_time": 0, "discarded": 0}
+    _metrics_logged: float = 0
+
+    @classmethod
+    def _create(cls) -> MiniRacer:
+        js_optimizer = MiniRacer()
+        js_optimizer.set_soft_memory_limit(cls.SOFT_MEMORY_LIMIT)
+        js_optimizer.set_hard_memory_limit(cls.HARD_MEMORY_LIMIT)
+        js_optimizer.eval(base64.b64decode(MAP_OPTIMIZER_JS).decode("utf-8"))
+        with cls._condition:
+            cls._stats["created"] = cls._stats["created"] + 1
+        return js_optimizer
+
+    @classmethod
+    def _reserve(cls) -> bool:
+        with cls._condition:
+            if cls._contexts >= cls.POOL_SIZE:
+                return False
+            cls._contexts = cls._contexts + 1
+            return True
+
+    @classmethod
+    def _unreserve(cls) -> None:
+        with cls._condition:
+            cls._contexts = cls._contexts - 1
+            cls._condition.notify()
+
+    @classmethod
+    def set_size(cls, size: int) -> None:
+        """Sets the maximum number of contexts, pool is shared so the last configured size is used by all devices."""
+        with cls._condition:
+            cls.POOL_SIZE = max(size, 1)
+            while cls._contexts > cls.POOL_SIZE and cls._idle:
+                cls._idle.pop().close()
+                cls._contexts = cls._contexts - 1
+            cls._condition.notify_all()
+
+    @classmethod
+    def warm_up(cls) -> None:
+        """Creates the contexts on background so first optimization does not need to wait for the script to be loaded."""
+        with cls._condition:
+            if cls._warming_up or cls._contexts >= cls.POOL_SIZE:
+                return
+            cls._warming_up = True
+
+        def create_contexts():
+            try:
+                while cls._reserve():
+                    try:
+                        js_optimizer = cls._create()
+                    except Exception as ex:
+                        cls._unreserve()
+                        _LOGGER.warning("Create map optimizer failed: %s", ex)
+                        return
+                    cls.release(js_optimizer)
+            finally:
+                with cls._condition:
+                    cls._warming_up = False
+
+        Thread(target=create_contexts, daemon=True).start()
+
+    @classmethod
+    def acquire(cls) -> MiniRacer:
+        now = time.time()
+        with cls._condition:
+            if not cls._idle and cls._contexts >= cls.POOL_SIZE:
+                cls._stats["waited"] = cls._stats["waited"] + 1
+                if not cls._condition.wait_for(lambda: cls._idle or cls._contexts < cls.POOL_SIZE, cls.ACQUIRE_TIMEOUT):
+                    raise TimeoutError("Map optimizer is not available")
+                cls._stats["wait_time"] = cls._stats["wait_time"] + time.time() - now
+
+            cls._stats["acquired"] = cls._stats["acquired"] + 1
+            if cls._idle:
+                return cls._idle.pop()
+            cls._contexts = cls._contexts + 1
+
+        try:
+            return cls._create()
+        except Exception:
+            cls._unreserve()
+            raise
+
+    @classmethod
+    def release(cls, js_optimizer: MiniRacer, failed: bool = False) -> None:
+        """Returns the context to the pool, contexts that failed or hit the memory limit are not reused."""
+        with cls._condition:
+            if not failed and cls._contexts <= cls.POOL_SIZE:
+                cls._idle.append(js_optimizer)
+                cls._condition.notify()
+                js_optimizer = None
+            else:
+                cls._contexts = cls._contexts - 1
+                cls._stats["discarded"] = cls._stats["discarded"] + 1
+                cls._condition.notify()
+
+            now = time.time()
+            log_metrics = now - cls._metrics_logged >= cls.METRICS_LOG_INTERVAL
+            if log_metrics:
+                cls._metrics_logged = now
+
+        if js_optimizer is not None:
+            js_optimizer.close()
+        if log_metrics and _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Map optimizer pool: %s", cls.metrics())
+
+    @classmethod
+    def metrics(cls) -> dict[str, Any]:
+        """Usage counters of the pool and the heap size of its idle contexts."""
+        with cls._condition:
+            metrics = dict(cls._stats)
+            metrics["size"] = cls.POOL_SIZE
+            metrics["contexts"] = cls._contexts
+            metrics["idle"] = len(cls._idle)
+            try:
+                metrics["used_heap_size"] = sum(
+                    js_optimizer.heap_stats().get("used_heap_size", 0) for js_optimizer in cls._idle
+                )
+            except Exception:
+                pass
+        return metrics
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Closes the idle contexts, they are created again when an optimizer is needed."""
+        _LOGGER.debug("Map optimizer pool: %s", cls.metrics())
+        with cls._condition:
+            idle = cls._idle
+            cls._idle = []
+            cls._contexts = cls._contexts - len(idle)
+            cls._condition.notify_all()
+        for js_optimizer in idle:
+            js_optimizer.close()
+
+
 class DreameVacuumMapOptimizer:
-    def __init__(self) -> None:
-        self._js_optimizer = None
+    TILE_SIZE = 32
+    TILE_HALO = 24
+    TILE_PADDING = 4
+    MAX_DIRTY_AREA = 0.25
+    FULL_OPTIMIZATION_INTERVAL = 30
+    OPTIMIZATION_CACHE_SIZE = 8
+    OPTIMIZATION_TIMEOUT = 2
+    OPTIMIZATION_TIME_LIMIT = 60
+
+    def __init__(self, cache_path: str = None) -> None:
+        self._optimization_key = None
+        self._tile_optimization_count = 0
+        self._cache_path = cache_path
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+        self._cache_lock: RLock = RLock()
+        self._update_callback = None
+        self._timeout: float = self.OPTIMIZATION_TIMEOUT
+        self._executor: ThreadPoolExecutor = None
+        self._job: Future = None
+        self._job_map_data: MapData = None
+        self._job_lock: RLock = RLock()
+        self._cancelled: Event = Event()
 
     def _clean_wall(self, data, width, height):
         for j in range(1, height - 1):
@@ -6071,94 +6646,356 @@ class DreameVacuumMapOptimizer:
             nim = ni + map_data.dimensions.width
             njm = nj + map_data.dimensions.height
 
-            pixel_type = np.zeros((width, height), np.uint8)
             data = map_data.optimized_pixel_type if map_data.optimized_pixel_type is not None else map_data.pixel_type
 
-            for j in range(height):
-                for i in range(width):
-                    if j >= sj and i >= si and j < sjm and i < sim:
-                        saved_value = int(saved_map_data.pixel_type[(i - si), (j - sj)])
-                    else:
-                        saved_value = 0
-
-                    if j >= nj and i >= ni and j < njm and i < nim:
-                        clean_value = int(data[(i - ni), (j - nj)])
-                    else:
-                        clean_value = 0
-
-                    if saved_value != 0:
-                        if saved_value != 255:
-                            pixel_type[i, j] = saved_value
-                        else:
-                            if clean_value != 0 and clean_value != 255:
-                                pixel_type[i, j] = 254
-                            else:
-                                pixel_type[i, j] = 255
-                    elif clean_value != 0:
-                        if clean_value == 255:
-                            pixel_type[i, j] = 255
-                        else:
-                            pixel_type[i, j] = 254
+            # Place both images on the merged image size
+            saved_value = np.zeros((width, height), np.uint8)
+            sim = min(sim, width)
+            sjm = min(sjm, height)
+            saved_value[si:sim, sj:sjm] = saved_map_data.pixel_type[: sim - si, : sjm - sj]
+
+            clean_value = np.zeros((width, height), np.uint8)
+            nim = min(nim, width)
+            njm = min(njm, height)
+            clean_value[ni:nim, nj:njm] = data[: nim - ni, : njm - nj]
+
+            # Saved map pixels are used as they are except walls, walls that are cleaned on current map are set to 254
+            clean = (clean_value != 0) & (clean_value != 255)
+            pixel_type = np.where(
+                saved_value != 0,
+                np.where(saved_value != 255, saved_value, np.where(clean, 254, 255)),
+                np.where(clean_value == 255, 255, np.where(clean, 254, 0)),
+            ).astype(np.uint8)
 
             if original_data is not None:
-                for j in range(height):
-                    for i in range(width):
-                        if j >= nj and i >= ni and j < njm and i < nim:
-                            if (
-                                original_data[(j - nj) * map_data.dimensions.width + (i - ni)] == 2
-                                and pixel_type[i, j] != 0
-                            ):
-                                dis = 3
-                                hasBorder = False
-                                for _j in range(j - dis, j + dis + 1):
-                                    for _i in range(i - dis, i + dis):
-                                        if _j < 0 or _i < 0 or _j >= height or _i >= width:
-                                            continue
-                                        if hasBorder:
-                                            break
-                                        if pixel_type[_i, _j] == 255:
-                                            hasBorder = True
-                                            break
-
-                                if not hasBorder:
-                                    pixel_type[i, j] = 251
+                # Wall pixels on original data that has no wall around them on the merged image are set to 251.
+                # Area that is checked for walls is from i - 3 to i + 2 horizontally and from j - 3 to j + 3 vertically.
+                border = np.pad(pixel_type == 255, ((3, 2), (3, 3)))
+                has_border = np.zeros((width, height + 6), bool)
+                for k in range(6):
+                    has_border |= border[k : k + width, :]
+                border = has_border
+                has_border = np.zeros((width, height), bool)
+                for k in range(7):
+                    has_border |= border[:, k : k + height]
+
+                original_data = (
+                    np.asarray(original_data).reshape(map_data.dimensions.height, map_data.dimensions.width).T
+                )
+                wall = np.zeros((width, height), bool)
+                wall[ni:nim, nj:njm] = original_data[: nim - ni, : njm - nj] == 2
+                pixel_type[wall & (pixel_type != 0) & ~has_border] = 251
 
             map_data.optimized_pixel_type = pixel_type
             map_data.optimized_dimensions = MapImageDimensions(top, left, height, width, map_data.dimensions.grid_size)
 
-    def optimize(self, map_data, saved_map_data=None, js_optimizer=True):
-        if map_data.saved_map:
-            return map_data
+    @staticmethod
+    def _optimization_key(map_data, saved_map_data) -> tuple:
+        return (
+            map_data.map_id,
+            map_data.dimensions.top,
+            map_data.dimensions.left,
+            map_data.dimensions.height,
+            map_data.dimensions.width,
+            map_data.dimensions.grid_size,
+            (
+                (map_data.charger_position.x, map_data.charger_position.y, map_data.charger_position.a)
+                if map_data.charger_position
+                else None
+            ),
+            (saved_map_data.map_id, saved_map_data.pixel_fingerprint) if saved_map_data else None,
+        )
 
-        try:
-            now = time.time()
+    @staticmethod
+    def _cache_key(map_data, saved_map_data, js_optimizer) -> str:
+        """Digest of everything the optimizer output depends on, it is stable across restarts to be used as file name."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((DreameVacuumMapOptimizer._optimization_key(map_data, None), bool(js_optimizer))).encode())
+        digest.update(np.ascontiguousarray(map_data.pixel_type).tobytes())
+        if saved_map_data:
+            dimensions = saved_map_data.dimensions
+            digest.update(
+                repr(
+                    (
+                        saved_map_data.map_id,
+                        dimensions.top,
+                        dimensions.left,
+                        dimensions.height,
+                        dimensions.width,
+                        dimensions.grid_size,
+                    )
+                ).encode()
+            )
+            digest.update(np.ascontiguousarray(saved_map_data.pixel_type).tobytes())
+        return digest.hexdigest()
+
+    def _load_cached(self, map_data, cache_key) -> bool:
+        with self._cache_lock:
+            result = self._cache.get(cache_key)
+
+        if result is None and self._cache_path:
+            file = os.path.join(self._cache_path, f"{cache_key}.npz")
+            if os.path.isfile(file):
+                try:
+                    with np.load(file, allow_pickle=False) as data:
+                        metadata = json.loads(str(data["metadata"]))
+                        dimensions = metadata["dimensions"]
+                        charger_position = metadata["charger_position"]
+                        result = (
+                            data["pixel_type"],
+                            MapImageDimensions(*dimensions) if dimensions else None,
+                            Point(*charger_position) if charger_position else None,
+                        )
+                except Exception as ex:
+                    _LOGGER.debug("Load optimized map failed: %s", ex)
+
+        if result is None:
+            return False
+
+        with self._cache_lock:
+            self._cache[cache_key] = result
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.OPTIMIZATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        # Cached image is never modified, it is replaced when map data is optimized again
+        map_data.optimized_pixel_type = result[0]
+        map_data.optimized_dimensions = copy.copy(result[1])
+        map_data.optimized_charger_position = copy.copy(result[2])
+        return True
 
-            if js_optimizer:
-                if self._js_optimizer == None:
-                    self._js_optimizer = MiniRacer()
-                    self._js_optimizer.eval(base64.b64decode(MAP_OPTIMIZER_JS).decode("utf-8"))
-
-                data = map_data.pixel_type.tolist()
-                data_size = [
-                    map_data.dimensions.left,
-                    map_data.dimensions.top,
-                    map_data.dimensions.width,
-                    map_data.dimensions.height,
-                    map_data.dimensions.grid_size,
+    def _store_cached(self, map_data, cache_key) -> None:
+        dimensions = map_data.optimized_dimensions
+        charger_position = map_data.optimized_charger_position
+        with self._cache_lock:
+            self._cache[cache_key] = (
+                map_data.optimized_pixel_type,
+                copy.copy(dimensions),
+                copy.copy(charger_position),
+            )
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.OPTIMIZATION_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+        if self._cache_path:
+            try:
+                os.makedirs(self._cache_path, exist_ok=True)
+                file = os.path.join(self._cache_path, f"{cache_key}.npz")
+                metadata = {
+                    "dimensions": (
+                        [dimensions.top, dimensions.left, dimensions.height, dimensions.width, dimensions.grid_size]
+                        if dimensions
+                        else None
+                    ),
+                    "charger_position": (
+                        [charger_position.x, charger_position.y, charger_position.a] if charger_position else None
+                    ),
+                }
+                # Temporary file is unique to the thread so concurrent writes of the same result do not collide
+                temporary_file = f"{file}.{get_ident()}.tmp"
+                with open(temporary_file, "wb") as output:
+                    np.savez_compressed(
+                        output, pixel_type=map_data.optimized_pixel_type, metadata=np.array(json.dumps(metadata))
+                    )
+                os.replace(temporary_file, file)
+
+                # Keep only the most recent results on disk
+                files = sorted(
+                    (entry for entry in os.scandir(self._cache_path) if entry.name.endswith(".npz")),
+                    key=lambda entry: entry.stat().st_mtime,
+                )
+                for entry in files[: -self.OPTIMIZATION_CACHE_SIZE]:
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+            except Exception as ex:
+                _LOGGER.debug("Store optimized map failed: %s", ex)
+
+    def _optimize_tiles(self, map_data, saved_map_data) -> bool:
+        """Optimizes the area of the changed tiles with a border around it and copies the result into the previously
+        optimized image. Returns False when the area cannot be optimized separately from the rest of the map.
+        Only the Python optimizer is used because its output is verified to match the full optimization, JS optimizer
+        works on the whole image and its output on a cropped window is not."""
+        dimensions = map_data.dimensions
+        grid_size = dimensions.grid_size
+        tiles = np.array(list(map_data.dirty_tiles))
+        x0 = int(tiles[:, 0].min()) * self.TILE_SIZE
+        y0 = int(tiles[:, 1].min()) * self.TILE_SIZE
+        x1 = min((int(tiles[:, 0].max()) + 1) * self.TILE_SIZE, dimensions.width)
+        y1 = min((int(tiles[:, 1].max()) + 1) * self.TILE_SIZE, dimensions.height)
+        if (x1 - x0) * (y1 - y0) > dimensions.width * dimensions.height * self.MAX_DIRTY_AREA:
+            return False
+
+        wx0 = max(x0 - self.TILE_HALO, 0)
+        wy0 = max(y0 - self.TILE_HALO, 0)
+        wx1 = min(x1 + self.TILE_HALO, dimensions.width)
+        wy1 = min(y1 + self.TILE_HALO, dimensions.height)
+
+        # Optimizer expects an empty border around the map like on the full image
+        padding = self.TILE_PADDING
+        window = MapData()
+        window.map_id = map_data.map_id
+        window.frame_id = map_data.frame_id
+        window.dimensions = MapImageDimensions(
+            dimensions.top + (wy0 - padding) * grid_size,
+            dimensions.left + (wx0 - padding) * grid_size,
+            wy1 - wy0 + padding * 2,
+            wx1 - wx0 + padding * 2,
+            grid_size,
+        )
+        window.pixel_type = np.pad(map_data.pixel_type[wx0:wx1, wy0:wy1], padding)
+
+        saved_window = None
+        if saved_map_data:
+            # Saved map is cropped to the same area so optimizer runs in the same mode with the same output size
+            saved_window = MapData()
+            saved_window.map_id = saved_map_data.map_id
+            saved_window.dimensions = window.dimensions
+            saved_window.pixel_type = np.zeros((window.dimensions.width, window.dimensions.height), np.uint8)
+            saved_dimensions = saved_map_data.dimensions
+            sx = int((window.dimensions.left - saved_dimensions.left) / grid_size)
+            sy = int((window.dimensions.top - saved_dimensions.top) / grid_size)
+            cx0 = max(sx, 0)
+            cy0 = max(sy, 0)
+            cx1 = min(sx + window.dimensions.width, saved_dimensions.width)
+            cy1 = min(sy + window.dimensions.height, saved_dimensions.height)
+            if cx0 < cx1 and cy0 < cy1:
+                saved_window.pixel_type[cx0 - sx : cx1 - sx, cy0 - sy : cy1 - sy] = saved_map_data.pixel_type[
+                    cx0:cx1, cy0:cy1
                 ]
-                saved_data = saved_map_data.pixel_type.tolist() if saved_map_data else None
-                saved_data_size = (
-                    [
-                        saved_map_data.dimensions.left,
-                        saved_map_data.dimensions.top,
-                        saved_map_data.dimensions.width,
-                        saved_map_data.dimensions.height,
-                        saved_map_data.dimensions.grid_size,
-                    ]
-                    if saved_map_data
-                    else None
+
+        if not self._optimize(window, saved_window, False, 0) or window.optimized_pixel_type is None:
+            return False
+
+        # Only the changed area is copied back because the optimizer output near the window border is not reliable
+        optimized_dimensions = map_data.optimized_dimensions or dimensions
+        window_dimensions = window.optimized_dimensions or window.dimensions
+        left = dimensions.left + x0 * grid_size
+        top = dimensions.top + y0 * grid_size
+        ox = int((left - optimized_dimensions.left) / grid_size)
+        oy = int((top - optimized_dimensions.top) / grid_size)
+        wx = int((left - window_dimensions.left) / grid_size)
+        wy = int((top - window_dimensions.top) / grid_size)
+        width = x1 - x0
+        height = y1 - y0
+        if (
+            min(ox, oy, wx, wy) < 0
+            or ox + width > map_data.optimized_pixel_type.shape[0]
+            or oy + height > map_data.optimized_pixel_type.shape[1]
+            or wx + width > window.optimized_pixel_type.shape[0]
+            or wy + height > window.optimized_pixel_type.shape[1]
+        ):
+            return False
+
+        # Optimized image can be shared with the rendered copies so it is replaced instead of modified
+        pixel_type = map_data.optimized_pixel_type.copy()
+        pixel_type[ox : ox + width, oy : oy + height] = window.optimized_pixel_type[wx : wx + width, wy : wy + height]
+        map_data.optimized_pixel_type = pixel_type
+        return True
+
+    def _optimize(self, map_data, saved_map_data, js_optimizer, min_points=2000) -> bool:
+        if js_optimizer:
+            data = map_data.pixel_type.tolist()
+            data_size = [
+                map_data.dimensions.left,
+                map_data.dimensions.top,
+                map_data.dimensions.width,
+                map_data.dimensions.height,
+                map_data.dimensions.grid_size,
+            ]
+            saved_data = saved_map_data.pixel_type.tolist() if saved_map_data else None
+            saved_data_size = (
+                [
+                    saved_map_data.dimensions.left,
+                    saved_map_data.dimensions.top,
+                    saved_map_data.dimensions.width,
+                    saved_map_data.dimensions.height,
+                    saved_map_data.dimensions.grid_size,
+                ]
+                if saved_map_data
+                else None
+            )
+            charger_position = None
+            if map_data.charger_position:
+                left = map_data.dimensions.left
+                top = map_data.dimensions.top
+
+                if saved_map_data:
+                    if saved_map_data.dimensions.left < left:
+                        left = saved_map_data.dimensions.left
+
+                    if saved_map_data.dimensions.top < top:
+                        top = saved_map_data.dimensions.top
+
+                charger_position = [
+                    (map_data.charger_position.x - left) / map_data.dimensions.grid_size,
+                    (map_data.charger_position.y - top) / map_data.dimensions.grid_size,
+                    map_data.charger_position.a,
+                ]
+
+            context = DreameVacuumMapOptimizerPool.acquire()
+            failed = True
+            try:
+                result = context.call(
+                    "optimize",
+                    data,
+                    data_size,
+                    saved_data,
+                    saved_data_size,
+                    charger_position,
+                    timeout_sec=self.OPTIMIZATION_TIME_LIMIT,
+                )
+                failed = context.was_hard_memory_limit_reached()
+            finally:
+                DreameVacuumMapOptimizerPool.release(context, failed)
+
+            if result and result[0]:
+                map_data.optimized_pixel_type = np.array(result[0], dtype=np.uint8)
+
+                dimensions = result[1]
+                map_data.optimized_dimensions = MapImageDimensions(
+                    dimensions[1], dimensions[0], dimensions[3], dimensions[2], map_data.dimensions.grid_size
                 )
-                charger_position = None
+
+                if result[2] and map_data.charger_position:
+                    charger = result[2]
+                    # map_data.optimized_charger_position = Point(charger[0] * map_data.dimensions.grid_size + left, charger[1] * map_data.dimensions.grid_size + top, charger[2])
+                return True
+            return False
+        else:
+            width = map_data.dimensions.width
+            height = map_data.dimensions.height
+            clean_data = np.zeros((width * height), np.uint8).tolist()
+
+            data_map = {255: 2, 253: 1, 250: 3}
+            pointNum = 0
+            for j in range(height):
+                for i in range(width):
+                    index = j * width + i
+                    clean_data[index] = int(map_data.pixel_type[i, j])
+                    if clean_data[index]:
+                        pointNum = pointNum + 1
+                        clean_data[index] = data_map.get(clean_data[index], 0)
+
+            original_data = clean_data.copy()
+            pixel_type = np.zeros((width, height), np.uint8)
+
+            self._clean_wall(clean_data, width, height)
+            self._fill_map_data(clean_data, width, height, 3)
+            self._denoise(clean_data, width, height)
+            self._check_cancelled()
+            self._update_border_value(clean_data, width, height, 5)
+            self._fill_cross_line(clean_data, width, height, 5)
+            self._link_adjacent_areas(original_data, clean_data, width, height, 5)
+            self._check_cancelled()
+
+            optimized = False
+            result = self._find_outline(clean_data, width, height, 5, True)
+            if result:
+                self._check_cancelled()
+                self._fill_map_data_2(clean_data, width, height)
+                self._update_border_value(clean_data, width, height, 6)
                 if map_data.charger_position:
                     left = map_data.dimensions.left
                     top = map_data.dimensions.top
@@ -6170,111 +7007,106 @@ class DreameVacuumMapOptimizer:
                         if saved_map_data.dimensions.top < top:
                             top = saved_map_data.dimensions.top
 
-                    charger_position = [
-                        (map_data.charger_position.x - left) / map_data.dimensions.grid_size,
-                        (map_data.charger_position.y - top) / map_data.dimensions.grid_size,
-                        map_data.charger_position.a,
-                    ]
-
-                result = self._js_optimizer.call(
-                    "optimize", data, data_size, saved_data, saved_data_size, charger_position
-                )
-                if result and result[0]:
-                    map_data.optimized_pixel_type = np.array(result[0], dtype=np.uint8)
+                    new_charger_position = copy.deepcopy(map_data.charger_position)
+                    new_charger_position.x = int((new_charger_position.x - left) / map_data.dimensions.grid_size)
+                    new_charger_position.y = int((new_charger_position.y - top) / map_data.dimensions.grid_size)
+                    if (
+                        new_charger_position.y >= 0
+                        and new_charger_position.x >= 0
+                        and new_charger_position.y < height
+                        and new_charger_position.x < width
+                        and clean_data[
+                            int(math.floor(new_charger_position.y)) * width + int(math.floor(new_charger_position.x))
+                        ]
+                    ):
+                        new_charger_position = self._calculate_charger_position(
+                            clean_data, width, height, 6, new_charger_position
+                        )
+                        map_data.optimized_charger_position = Point(
+                            int(new_charger_position.x * map_data.dimensions.grid_size) + left,
+                            int(new_charger_position.y * map_data.dimensions.grid_size) + top,
+                            new_charger_position.a,
+                        )
 
-                    dimensions = result[1]
-                    map_data.optimized_dimensions = MapImageDimensions(
-                        dimensions[1], dimensions[0], dimensions[3], dimensions[2], map_data.dimensions.grid_size
-                    )
+                self._find_outline(clean_data, width, height, 6, False)
+                self._fill_map_data_2(clean_data, width, height)
+                self._update_border_value(clean_data, width, height, 7)
+                self._check_cancelled()
 
-                    if result[2] and map_data.charger_position:
-                        charger = result[2]
-                        # map_data.optimized_charger_position = Point(charger[0] * map_data.dimensions.grid_size + left, charger[1] * map_data.dimensions.grid_size + top, charger[2])
-            else:
-                width = map_data.dimensions.width
-                height = map_data.dimensions.height
-                clean_data = np.zeros((width * height), np.uint8).tolist()
+                if saved_map_data:
+                    self._find_obstacle_border(clean_data, width, height, 3)
+                    self._obstacle_data(original_data, width, height)
+                else:
+                    self._clean_small_obstacle(clean_data, width, height, 3)
 
-                data_map = {255: 2, 253: 1, 250: 3}
-                pointNum = 0
+                currentPointNum = 0
+                data_map = {7: 255, 2: 255, 3: (0 if saved_map_data else 250)}
                 for j in range(height):
                     for i in range(width):
-                        index = j * width + i
-                        clean_data[index] = int(map_data.pixel_type[i, j])
-                        if clean_data[index]:
-                            pointNum = pointNum + 1
-                            clean_data[index] = data_map.get(clean_data[index], 0)
-
-                original_data = clean_data.copy()
-                pixel_type = np.zeros((width, height), np.uint8)
-
-                self._clean_wall(clean_data, width, height)
-                self._fill_map_data(clean_data, width, height, 3)
-                self._denoise(clean_data, width, height)
-                self._update_border_value(clean_data, width, height, 5)
-                self._fill_cross_line(clean_data, width, height, 5)
-                self._link_adjacent_areas(original_data, clean_data, width, height, 5)
-
-                result = self._find_outline(clean_data, width, height, 5, True)
-                if result:
-                    self._fill_map_data_2(clean_data, width, height)
-                    self._update_border_value(clean_data, width, height, 6)
-                    if map_data.charger_position:
-                        left = map_data.dimensions.left
-                        top = map_data.dimensions.top
-
-                        if saved_map_data:
-                            if saved_map_data.dimensions.left < left:
-                                left = saved_map_data.dimensions.left
-
-                            if saved_map_data.dimensions.top < top:
-                                top = saved_map_data.dimensions.top
-
-                        new_charger_position = copy.deepcopy(map_data.charger_position)
-                        new_charger_position.x = int((new_charger_position.x - left) / map_data.dimensions.grid_size)
-                        new_charger_position.y = int((new_charger_position.y - top) / map_data.dimensions.grid_size)
-                        if (
-                            new_charger_position.y >= 0
-                            and new_charger_position.x >= 0
-                            and new_charger_position.y < height
-                            and new_charger_position.x < width
-                            and clean_data[
-                                int(math.floor(new_charger_position.y)) * width
-                                + int(math.floor(new_charger_position.x))
-                            ]
-                        ):
-                            new_charger_position = self._calculate_charger_position(
-                                clean_data, width, height, 6, new_charger_position
-                            )
-                            map_data.optimized_charger_position = Point(
-                                int(new_charger_position.x * map_data.dimensions.grid_size) + left,
-                                int(new_charger_position.y * map_data.dimensions.grid_size) + top,
-                                new_charger_position.a,
-                            )
+                        clean_value = clean_data[j * width + i]
+                        if clean_value != 0:
+                            currentPointNum = currentPointNum + 1
+                            pixel_type[i, j] = data_map.get(clean_value, 253)
 
-                    self._find_outline(clean_data, width, height, 6, False)
-                    self._fill_map_data_2(clean_data, width, height)
-                    self._update_border_value(clean_data, width, height, 7)
+                if not ((currentPointNum * 100) / pointNum) < 50 and pointNum > min_points:
+                    map_data.optimized_pixel_type = pixel_type
+                    optimized = True
 
-                    if saved_map_data:
-                        self._find_obstacle_border(clean_data, width, height, 3)
-                        self._obstacle_data(original_data, width, height)
-                    else:
-                        self._clean_small_obstacle(clean_data, width, height, 3)
+            self._merge_saved_map_data(map_data, saved_map_data, original_data)
+            return optimized
+
+    def optimize(self, map_data, saved_map_data=None, js_optimizer=True):
+        if map_data.saved_map:
+            return map_data
+
+        key = DreameVacuumMapOptimizer._optimization_key(map_data, saved_map_data)
+        if (
+            not js_optimizer
+            and map_data.dirty_tiles is not None
+            and map_data.optimized_pixel_type is not None
+            and key == self._optimization_key
+            and self._tile_optimization_count < self.FULL_OPTIMIZATION_INTERVAL
+        ):
+            if not map_data.dirty_tiles:
+                return map_data
 
-                    currentPointNum = 0
-                    data_map = {7: 255, 2: 255, 3: (0 if saved_map_data else 250)}
-                    for j in range(height):
-                        for i in range(width):
-                            clean_value = clean_data[j * width + i]
-                            if clean_value != 0:
-                                currentPointNum = currentPointNum + 1
-                                pixel_type[i, j] = data_map.get(clean_value, 253)
+            try:
+                now = time.time()
+                if self._optimize_tiles(map_data, saved_map_data):
+                    self._tile_optimization_count = self._tile_optimization_count + 1
+                    _LOGGER.info(
+                        "Optimize Map Data: %s:%s tiles: %s took: %.2f",
+                        map_data.map_id,
+                        map_data.frame_id,
+                        len(map_data.dirty_tiles),
+                        time.time() - now,
+                    )
+                    map_data.dirty_tiles = set()
+                    return map_data
+            except CancelledError:
+                return map_data
+            except Exception as ex:
+                _LOGGER.debug("Optimize map tiles failed: %s", ex)
 
-                    if not ((currentPointNum * 100) / pointNum) < 50 and pointNum > 2000:
-                        map_data.optimized_pixel_type = pixel_type
+        self._optimization_key = None
+        map_data.dirty_tiles = None
+        try:
+            now = time.time()
 
-                self._merge_saved_map_data(map_data, saved_map_data, original_data)
+            # Same image is received again after restarts, map changes and with unchanged I frames
+            cache_key = DreameVacuumMapOptimizer._cache_key(map_data, saved_map_data, js_optimizer)
+            if self._load_cached(map_data, cache_key):
+                self._optimization_key = key
+                self._tile_optimization_count = 0
+                map_data.dirty_tiles = set()
+                _LOGGER.debug("Optimize Map Data: %s:%s cached", map_data.map_id, map_data.frame_id)
+                return map_data
+
+            if self._optimize(map_data, saved_map_data, js_optimizer):
+                self._optimization_key = key
+                self._tile_optimization_count = 0
+                map_data.dirty_tiles = set()
+                self._store_cached(map_data, cache_key)
 
             _LOGGER.info(
                 "Optimize Map Data: %s:%s took: %.2f",
@@ -6282,6 +7114,8 @@ class DreameVacuumMapOptimizer:
                 map_data.frame_id,
                 time.time() - now,
             )
+        except CancelledError:
+            _LOGGER.debug("Optimize Map Data: %s:%s cancelled", map_data.map_id, map_data.frame_id)
         except Exception as ex:
             _LOGGER.warning("Optimize map failed: %s", ex)
 
@@ -6296,3 +7130,88 @@ class DreameVacuumMapOptimizer:
             #    """)
 
         return map_data
+
+    def _check_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise CancelledError()
+
+    def _optimize_job(self, map_data, job_map_data, saved_map_data, js_optimizer) -> bool:
+        self._cancelled.clear()
+        now = time.time()
+        self.optimize(job_map_data, saved_map_data, js_optimizer)
+        if self._cancelled.is_set():
+            return False
+
+        map_data.optimized_pixel_type = job_map_data.optimized_pixel_type
+        map_data.optimized_dimensions = job_map_data.optimized_dimensions
+        map_data.optimized_charger_position = job_map_data.optimized_charger_position
+        if map_data.pixel_type is job_map_data.pixel_type:
+            map_data.dirty_tiles = job_map_data.dirty_tiles
+            map_data.need_optimization = False
+            if map_data.pixel_type is not job_map_data.pixel_type:
+                # New frame is received while flags are being updated
+                map_data.dirty_tiles = None
+                map_data.need_optimization = True
+
+        if time.time() - now > self._timeout:
+            # Renderer did not wait for the result, notify it to render the map again with the optimized image
+            map_data.last_updated = time.time()
+            if self._update_callback and not self._cancelled.is_set():
+                self._update_callback()
+        return True
+
+    def listen(self, callback) -> None:
+        self._update_callback = callback
+
+    def set_timeout(self, timeout: float) -> None:
+        """Sets how long the renderer waits for the optimization before rendering the unoptimized map."""
+        self._timeout = timeout
+
+    def cancel(self) -> None:
+        """Stops the running optimization at its next step and discards its result."""
+        self._cancelled.set()
+
+    def shutdown(self) -> None:
+        """Cancels the running and queued optimizations and releases the worker thread without waiting for it."""
+        with self._job_lock:
+            self.cancel()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._job = None
+            self._job_map_data = None
+
+    def optimize_in_time(self, map_data, saved_map_data=None, js_optimizer=True) -> bool:
+        """Optimizes map data on background and waits for it up to the time budget. Returns False if it is not completed
+        in time, optimization continues and listener is notified when its result is set to the map data."""
+        with self._job_lock:
+            job = self._job
+            if job is None or job.done() or self._job_map_data is not map_data:
+                if job is not None and not job.done():
+                    # Result of the previous map is not needed anymore
+                    self.cancel()
+
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dreame_map_optimizer")
+
+                # Optimization runs on a copy because map data can be updated with new frames in the mean time
+                job = self._executor.submit(
+                    self._optimize_job, map_data, copy.copy(map_data), saved_map_data, js_optimizer
+                )
+                self._job = job
+                self._job_map_data = map_data
+
+        try:
+            return job.result(self._timeout)
+        except TimeoutError:
+            _LOGGER.info(
+                "Optimize Map Data: %s:%s did not complete in %.1fs, continuing on background",
+                map_data.map_id,
+                map_data.frame_id,
+                self._timeout,
+            )
+        except CancelledError:
+            pass
+        except Exception as ex:
+            _LOGGER.warning("Optimize map failed: %s", ex)
+        return False
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import copy
+import hashlib
 import math
-from typing import Any, Dict, Final, List, Optional
+import numpy as np
+from collections import deque
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Dict, Final, List, Optional, Set, Tuple
 from enum import IntEnum, Enum
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -764,6 +769,22 @@ PROPERTY_AVAILABILITY: Final = {
     ),
 }
 
+# Properties that the frequently changing status attributes are derived from, entities that display these attributes
+# subscribe to them instead of being updated on every property change
+CHARGING_PROPERTIES: Final = [DreameVacuumProperty.CHARGING_STATUS, DreameVacuumProperty.BATTERY_LEVEL]
+DOCKED_PROPERTIES: Final = [*CHARGING_PROPERTIES, DreameVacuumProperty.SELF_WASH_BASE_STATUS]
+FAST_MAPPING_PROPERTIES: Final = [
+    DreameVacuumProperty.STATE,
+    DreameVacuumProperty.STATUS,
+    DreameVacuumProperty.TASK_STATUS,
+]
+STATE_PROPERTIES: Final = [
+    *DOCKED_PROPERTIES,
+    DreameVacuumProperty.STATE,
+    DreameVacuumProperty.TASK_STATUS,
+    DreameVacuumProperty.CLEANING_PAUSED,
+]
+
 ACTION_AVAILABILITY: Final = {
     DreameVacuumAction.RESET_MAIN_BRUSH: lambda device: bool(device.status.main_brush_life < 100),
     DreameVacuumAction.RESET_SIDE_BRUSH: lambda device: bool(device.status.side_brush_life < 100),
@@ -799,6 +820,126 @@ def DIID(property: DreameVacuumProperty, mapping=DreameVacuumPropertyMapping) ->
         return f'{mapping[property]["siid"]}.{mapping[property]["piid"]}'
 
 
+class DreameVacuumPropertyStore(MutableMapping):
+    """Device property values keyed by property id and stored at a fixed index per property.
+    Every change increases the store version and is recorded to a journal, so the properties changed since a version
+    can be listed without comparing the values again."""
+
+    JOURNAL_SIZE: Final = 1024
+
+    def __init__(self) -> None:
+        self._index: dict[int, int] = {}
+        self._dids: list[int] = []
+        for prop in DreameVacuumProperty:
+            self._index[prop.value] = len(self._dids)
+            self._dids.append(prop.value)
+        size = len(self._dids)
+        self._values: list[Any] = [None] * size
+        self._previous_values: list[Any] = [None] * size
+        self._present = np.zeros(size, bool)
+        self._versions = np.zeros(size, np.int64)
+        self._version: int = 0
+        # Property ids of the latest changes, last item is the change of the current version
+        self._journal: deque[int] = deque(maxlen=self.JOURNAL_SIZE)
+
+    def _add_index(self, did: int) -> int:
+        index = len(self._dids)
+        self._index[did] = index
+        self._dids.append(did)
+        self._values.append(None)
+        self._previous_values.append(None)
+        self._present = np.append(self._present, False)
+        self._versions = np.append(self._versions, 0)
+        return index
+
+    def _changed(self, did: int, index: int) -> None:
+        self._version = self._version + 1
+        self._versions[index] = self._version
+        self._journal.append(did)
+
+    def set(self, did: int, value: Any) -> bool:
+        """Sets the property value and returns True if it is changed."""
+        index = self._index.get(did)
+        if index is None:
+            index = self._add_index(did)
+        elif self._present[index]:
+            if self._values[index] == value:
+                return False
+            self._previous_values[index] = self._values[index]
+        else:
+            self._previous_values[index] = None
+
+        self._values[index] = value
+        self._present[index] = True
+        self._changed(did, index)
+        return True
+
+    def get(self, did: int, default: Any = None) -> Any:
+        index = self._index.get(did)
+        if index is None or not self._present[index]:
+            return default
+        return self._values[index]
+
+    def previous(self, did: int) -> Any:
+        """Value of the property before its last change."""
+        index = self._index.get(did)
+        if index is None:
+            return None
+        return self._previous_values[index]
+
+    def version_of(self, did: int) -> int:
+        """Store version of the last change of the property, 0 if it is never set."""
+        index = self._index.get(did)
+        if index is None:
+            return 0
+        return int(self._versions[index])
+
+    def changes_since(self, version: int) -> list[int]:
+        """Ids of the properties changed after given store version in the order of their last change."""
+        # Journal is copied before reading the version, it can be appended from another thread meanwhile
+        journal = list(self._journal)
+        count = self._version - version
+        if count <= 0:
+            return []
+        if count > len(journal):
+            # Journal does not go back that far
+            indexes = np.flatnonzero(self._versions > version)
+            return [self._dids[index] for index in indexes[np.argsort(self._versions[indexes])]]
+        return list(reversed(dict.fromkeys(reversed(journal[len(journal) - count :]))))
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __getitem__(self, did: int) -> Any:
+        index = self._index.get(did)
+        if index is None or not self._present[index]:
+            raise KeyError(did)
+        return self._values[index]
+
+    def __setitem__(self, did: int, value: Any) -> None:
+        self.set(did, value)
+
+    def __delitem__(self, did: int) -> None:
+        index = self._index.get(did)
+        if index is None or not self._present[index]:
+            raise KeyError(did)
+        self._previous_values[index] = self._values[index]
+        self._values[index] = None
+        self._present[index] = False
+        self._changed(did, index)
+
+    def __contains__(self, did: object) -> bool:
+        index = self._index.get(did)
+        return index is not None and bool(self._present[index])
+
+    def __iter__(self) -> Iterator[int]:
+        return (self._dids[index] for index in np.flatnonzero(self._present))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._present))
+
+
 class PathType(str, Enum):
     LINE = "L"
     SWEEP = "S"
@@ -822,6 +963,8 @@ class ObstacleType(IntEnum):
 
 
 class Point:
+    __slots__ = ("x", "y", "a")
+
     def __init__(self, x: float, y: float, a=None) -> None:
         self.x = x
         self.y = y
@@ -884,6 +1027,8 @@ class Point:
 
 
 class Path(Point):
+    __slots__ = ("path_type",)
+
     def __init__(self, x: float, y: float, path_type: PathType) -> None:
         super().__init__(x, y)
         self.path_type = path_type
@@ -895,7 +1040,111 @@ class Path(Point):
         return attributes
 
 
+class MapPath:
+    """Path points stored as coordinate and type arrays instead of a list of Path objects."""
+
+    LINE: Final = ord(PathType.LINE.value)
+    RECORD: Final = np.dtype([("x", "<i4"), ("y", "<i4"), ("path_type", "u1")])
+
+    def __init__(self, x=None, y=None, path_type=None) -> None:
+        self._x = np.array(x if x is not None else [], dtype=np.int32)
+        self._y = np.array(y if y is not None else [], dtype=np.int32)
+        self._path_type = np.array(path_type if path_type is not None else [], dtype=np.uint8)
+        self._size = len(self._x)
+        self._hash = hashlib.blake2b(digest_size=16)
+        self._update_hash(self._x, self._y, self._path_type)
+
+    def _update_hash(self, x, y, path_type) -> None:
+        # Points are hashed as packed records so the digest does not depend on how the path is split into frames
+        records = np.empty(len(x), dtype=MapPath.RECORD)
+        records["x"] = x
+        records["y"] = y
+        records["path_type"] = path_type
+        self._hash.update(records.tobytes())
+
+    @property
+    def fingerprint(self) -> tuple[int, bytes]:
+        return (self._size, self._hash.digest())
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[: self._size]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[: self._size]
+
+    @property
+    def path_type(self) -> np.ndarray:
+        return self._path_type[: self._size]
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._x):
+            capacity = max(size, len(self._x) * 2, 64)
+            for name in ("_x", "_y", "_path_type"):
+                array = getattr(self, name)
+                resized = np.empty(capacity, dtype=array.dtype)
+                resized[: self._size] = array[: self._size]
+                setattr(self, name, resized)
+
+    def append(self, x: int, y: int, path_type: PathType) -> None:
+        self._reserve(self._size + 1)
+        self._x[self._size] = x
+        self._y[self._size] = y
+        self._path_type[self._size] = ord(path_type.value)
+        self._update_hash([x], [y], [ord(path_type.value)])
+        self._size = self._size + 1
+
+    def extend(self, other: MapPath) -> None:
+        size = self._size + len(other)
+        self._reserve(size)
+        self._x[self._size : size] = other.x
+        self._y[self._size : size] = other.y
+        self._path_type[self._size : size] = other.path_type
+        self._update_hash(other.x, other.y, other.path_type)
+        self._size = size
+
+    def copy(self) -> MapPath:
+        return MapPath(self.x, self.y, self.path_type)
+
+    def view(self) -> MapPath:
+        """Returns a path sharing the buffers of this path. Appending to either one never changes the other because
+        the view is trimmed to the current size and new points are always written beyond it."""
+        path = MapPath()
+        path._x = self.x
+        path._y = self.y
+        path._path_type = self.path_type
+        path._size = self._size
+        path._hash = self._hash.copy()
+        return path
+
+    def __deepcopy__(self, memo) -> MapPath:
+        return self.copy()
+
+    def __reduce__(self):
+        return (MapPath, (self.x, self.y, self.path_type))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Path:
+        if index < 0:
+            index = index + self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("path index out of range")
+        return Path(int(self._x[index]), int(self._y[index]), PathType(chr(self._path_type[index])))
+
+    def __iter__(self):
+        for x, y, path_type in zip(self.x.tolist(), self.y.tolist(), self.path_type.tolist()):
+            yield Path(x, y, PathType(chr(path_type)))
+
+    def __eq__(self: MapPath, other: MapPath) -> bool:
+        return isinstance(other, MapPath) and self.fingerprint == other.fingerprint
+
+
 class Obstacle(Point):
+    __slots__ = ("obstacle_type", "possibility", "key", "file_name", "random")
+
     def __init__(
         self,
         x: float,
@@ -921,6 +1170,8 @@ class Obstacle(Point):
 
 
 class Zone:
+    __slots__ = ("x0", "y0", "x1", "y1")
+
     def __init__(self, x0: float, y0: float, x1: float, y1: float) -> None:
         self.x0 = x0
         self.y0 = y0
@@ -960,6 +1211,25 @@ class Zone:
 
 
 class Segment(Zone):
+    __slots__ = (
+        "segment_id",
+        "unique_id",
+        "x",
+        "y",
+        "name",
+        "custom_name",
+        "type",
+        "index",
+        "icon",
+        "neighbors",
+        "order",
+        "cleaning_times",
+        "suction_level",
+        "water_volume",
+        "cleaning_mode",
+        "color_index",
+    )
+
     def __init__(
         self,
         segment_id: int,
@@ -1096,6 +1366,29 @@ class Segment(Zone):
 
         return attributes
 
+    @property
+    def fingerprint(self) -> tuple:
+        """Hashable tuple of the fields compared in __eq__."""
+        return (
+            self.x0,
+            self.y0,
+            self.x1,
+            self.y1,
+            self.x,
+            self.y,
+            self.name,
+            self.index,
+            self.type,
+            self.color_index,
+            self.icon,
+            tuple(self.neighbors) if self.neighbors is not None else None,
+            self.order,
+            self.cleaning_times,
+            self.suction_level,
+            self.water_volume,
+            self.cleaning_mode,
+        )
+
     def __eq__(self: Segment, other: Segment) -> bool:
         return not (
             other is None
@@ -1126,6 +1419,8 @@ class Segment(Zone):
 
 
 class Wall:
+    __slots__ = ("x0", "y0", "x1", "y1")
+
     def __init__(self, x0: float, y0: float, x1: float, y1: float) -> None:
         self.x0 = x0
         self.y0 = y0
@@ -1165,6 +1460,8 @@ class Wall:
 
 
 class Area:
+    __slots__ = ("x0", "y0", "x1", "y1", "x2", "y2", "x3", "y3")
+
     def __init__(
         self,
         x0: float,
@@ -1235,6 +1532,8 @@ class Area:
 
 
 class MapImageDimensions:
+    __slots__ = ("top", "left", "height", "width", "grid_size", "scale", "padding", "crop", "bounds")
+
     def __init__(self, top: int, left: int, height: int, width: int, grid_size: int) -> None:
         self.top = top
         self.left = left
@@ -1319,7 +1618,7 @@ class MapData:
         self.no_go_areas: Optional[List[Area]] = None  # Data json: vw.rect
         self.no_mopping_areas: Optional[List[Area]] = None  # Data json: vw.mop
         self.walls: Optional[List[Wall]] = None  # Data json: vw.line
-        self.path: Optional[Path] = None  # Data json: tr
+        self.path: Optional[MapPath] = None  # Data json: tr
         self.active_segments: Optional[int] = None  # Data json: sa
         self.active_areas: Optional[List[Area]] = None  # Data json: da2
         self.active_points: Optional[List[Point]] = None  # Data json: sp
@@ -1355,6 +1654,8 @@ class MapData:
         self.last_updated: Optional[float] = None
         # For vslam map rendering optimization
         self.need_optimization: Optional[bool] = None
+        # Tiles changed since the last optimization, None when the whole map needs to be optimized
+        self.dirty_tiles: Optional[Set[Tuple[int, int]]] = None
 
     def __eq__(self: MapData, other: MapData) -> bool:
         if other is None:
@@ -1372,33 +1673,15 @@ class MapData:
         if self.robot_mode != other.robot_mode:
             return False
 
-        if self.robot_position != other.robot_position:
-            return False
-
-        if self.charger_position != other.charger_position:
-            return False
-
-        if self.no_go_areas != other.no_go_areas:
-            return False
-
-        if self.no_mopping_areas != other.no_mopping_areas:
-            return False
-
-        if self.walls != other.walls:
+        if self.robot_fingerprint != other.robot_fingerprint:
             return False
 
-        if self.docked != other.docked:
+        if self.zone_fingerprint != other.zone_fingerprint:
             return False
 
         if self.active_segments != other.active_segments:
             return False
 
-        if self.active_areas != other.active_areas:
-            return False
-
-        if self.active_points != other.active_points:
-            return False
-
         if self.clean_log != other.clean_log:
             return False
 
@@ -1425,6 +1708,72 @@ class MapData:
 
         return True
 
+    def view(self) -> MapData:
+        """Shallow copy of the map data for rendering. Large buffers like data and pixel_type are always replaced
+        instead of modified so they are shared, only the objects that are modified in place are copied."""
+        map_data = copy.copy(self)
+        if self.dimensions is not None:
+            map_data.dimensions = copy.copy(self.dimensions)
+        if self.optimized_dimensions is not None:
+            map_data.optimized_dimensions = copy.copy(self.optimized_dimensions)
+        if self.path is not None:
+            map_data.path = self.path.view()
+        if self.segments is not None:
+            map_data.segments = copy.deepcopy(self.segments)
+        if self.cleanset is not None:
+            map_data.cleanset = copy.deepcopy(self.cleanset)
+        for name in ("no_go_areas", "no_mopping_areas", "walls", "active_areas", "active_points", "obstacles"):
+            value = getattr(self, name)
+            if value is not None:
+                setattr(map_data, name, list(value))
+        return map_data
+
+    @property
+    def pixel_fingerprint(self) -> tuple | None:
+        """Raw map data is immutable bytes and Python caches their hash so this is computed once per frame.
+        Pixel type array is replaced instead of being modified so its identity tells which image is set on the view."""
+        if self.data is None or self.dimensions is None:
+            return None
+        return (
+            hash(self.data),
+            id(self.pixel_type),
+            self.dimensions.top,
+            self.dimensions.left,
+            self.dimensions.height,
+            self.dimensions.width,
+            self.dimensions.grid_size,
+        )
+
+    @property
+    def path_fingerprint(self) -> tuple | None:
+        return self.path.fingerprint if self.path is not None else None
+
+    @property
+    def segment_fingerprint(self) -> tuple | None:
+        if self.segments is None:
+            return None
+        return tuple((k, self.segments[k].fingerprint) for k in sorted(self.segments))
+
+    @property
+    def zone_fingerprint(self) -> tuple:
+        def zones(items):
+            return tuple(tuple(item.as_list()) for item in items) if items is not None else None
+
+        return (
+            zones(self.active_areas),
+            zones(self.no_go_areas),
+            zones(self.no_mopping_areas),
+            zones(self.walls),
+            tuple((p.x, p.y, p.a) for p in self.active_points) if self.active_points is not None else None,
+        )
+
+    @property
+    def robot_fingerprint(self) -> tuple:
+        def point(p):
+            return (p.x, p.y, p.a) if p is not None else None
+
+        return (point(self.robot_position), point(self.charger_position), self.docked)
+
     def as_dict(self) -> Dict[str, Any]:
         attributes_list = {}
         if self.charger_position is not None:
@@ -1621,6 +1970,45 @@ MAP_COLOR_SCHEME_LIST: Final = {
 MAP_ICON_SET_LIST: Final = {"Dreame": 0, "Dreame Old": 1, "Mijia": 2, "Material": 3}
 
 
+@dataclass
+class MapRendererImageFormat:
+    format: str = "PNG"
+    content_type: str = "image/png"
+    compress_level: int = 6
+    optimize: bool = False
+    lossless: bool = False
+    quality: int = None
+
+    @property
+    def save_params(self) -> dict[str, Any]:
+        if self.format == "PNG":
+            return {"compress_level": self.compress_level, "optimize": self.optimize}
+        if self.format == "WEBP":
+            params = {"lossless": self.lossless, "method": self.compress_level}
+            if self.quality is not None:
+                params["quality"] = self.quality
+            return params
+        if self.format == "JPEG":
+            return {"quality": self.quality if self.quality is not None else 85, "optimize": self.optimize}
+        return {}
+
+    @property
+    def alpha(self) -> bool:
+        return self.format != "JPEG"
+
+
+MAP_IMAGE_FORMAT_LIST: Final = {
+    "PNG": MapRendererImageFormat(),
+    "PNG (Fast)": MapRendererImageFormat(compress_level=1),
+    "PNG (Small)": MapRendererImageFormat(compress_level=9, optimize=True),
+    "WebP (Lossless)": MapRendererImageFormat(
+        format="WEBP", content_type="image/webp", compress_level=4, lossless=True, quality=80
+    ),
+    "JPEG (High Quality)": MapRendererImageFormat(format="JPEG", content_type="image/jpeg", quality=90),
+    "JPEG (Low Quality)": MapRendererImageFormat(format="JPEG", content_type="image/jpeg", quality=70),
+}
+
+
 class MapRendererLayer(IntEnum):
     IMAGE = 0
     OBJECTS = 1
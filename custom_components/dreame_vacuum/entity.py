@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict
+from concurrent.futures import Future
 from dataclasses import dataclass
 from collections.abc import Callable
 from functools import partial
@@ -34,6 +36,7 @@ class DreameVacuumEntityDescription:
     name: str = None
     entity_category: str = None
     property_key: DreameVacuumProperty = None
+    property_keys: list[DreameVacuumProperty] = None
     action_key: DreameVacuumAction = None
     exists_fn: Callable[[object, object], bool] = lambda description, device: bool(
         (description.action_key is not None and description.action_key in device.action_mapping)
@@ -85,7 +88,7 @@ class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
                 elif description.action_key is not None:
                     description.available_fn = ACTION_AVAILABILITY.get(description.action_key)
 
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator=coordinator, context=self._subscribed_properties(description))
         if description:
             if description.key is not None:
                 self._attr_translation_key = description.key
@@ -100,6 +103,27 @@ class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
             self._attr_name = self.entity_description.name
             self._attr_unique_id = f"{self.device.mac}_{self.entity_description.key}"
 
+    def _subscribed_properties(self, description: DreameVacuumEntityDescription) -> frozenset[int] | None:
+        """Ids of the properties that entity state is derived from, None if it is derived from the device status."""
+        if description is None:
+            return None
+
+        properties = description.property_keys
+        if properties is None:
+            if (
+                description.property_key is None
+                or description.value_fn is not None
+                or description.available_fn is not None
+                or description.icon_fn is not None
+                or description.attrs_fn is not None
+            ):
+                return None
+            properties = []
+
+        if description.property_key is not None:
+            properties = [description.property_key, *properties]
+        return frozenset(prop.value for prop in properties)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         if self.entity_description.icon_fn is not None:
@@ -109,7 +133,10 @@ class DreameVacuumEntity(CoordinatorEntity[DreameVacuumDataUpdateCoordinator]):
     async def _try_command(self, mask_error, func, *args, **kwargs) -> bool:
         """Call a vacuum command handling error messages."""
         try:
-            await self.hass.async_add_executor_job(partial(func, *args, **kwargs))
+            result = await self.hass.async_add_executor_job(partial(func, *args, **kwargs))
+            # Property writes are sent in batches, wait for the device to accept the write
+            if isinstance(result, Future):
+                await asyncio.wrap_future(result)
             return True
         except (InvalidActionException, InvalidValueException) as exc:
             LOGGER.error(mask_error, exc)
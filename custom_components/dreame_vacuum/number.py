@@ -34,6 +34,7 @@ class DreameVacuumNumberEntityDescription(DreameVacuumEntityDescription, NumberE
 NUMBERS: tuple[DreameVacuumNumberEntityDescription, ...] = (
     DreameVacuumNumberEntityDescription(
         property_key=DreameVacuumProperty.VOLUME,
+        property_keys=[],
         icon_fn=lambda value, device: "mdi:volume-off" if value == 0 else "mdi:volume-high",
         mode=NumberMode.SLIDER,
         native_min_value=0,
@@ -55,6 +56,7 @@ NUMBERS: tuple[DreameVacuumNumberEntityDescription, ...] = (
     DreameVacuumNumberEntityDescription(
         property_key=DreameVacuumProperty.DND_START,
         key="dnd_start_hour",
+        property_keys=[DreameVacuumProperty.DND],
         icon="mdi:clock-start",
         mode=NumberMode.BOX,
         native_min_value=0,
@@ -68,6 +70,7 @@ NUMBERS: tuple[DreameVacuumNumberEntityDescription, ...] = (
     DreameVacuumNumberEntityDescription(
         property_key=DreameVacuumProperty.DND_START,
         key="dnd_start_minute",
+        property_keys=[DreameVacuumProperty.DND],
         icon="mdi:clock-start",
         mode=NumberMode.BOX,
         native_min_value=0,
@@ -81,6 +84,7 @@ NUMBERS: tuple[DreameVacuumNumberEntityDescription, ...] = (
     DreameVacuumNumberEntityDescription(
         property_key=DreameVacuumProperty.DND_END,
         key="dnd_end_hour",
+        property_keys=[DreameVacuumProperty.DND],
         icon="mdi:clock-end",
         mode=NumberMode.BOX,
         native_min_value=0,
@@ -94,6 +98,7 @@ NUMBERS: tuple[DreameVacuumNumberEntityDescription, ...] = (
     DreameVacuumNumberEntityDescription(
         property_key=DreameVacuumProperty.DND_END,
         key="dnd_end_minute",
+        property_keys=[DreameVacuumProperty.DND],
         icon="mdi:clock-end",
         mode=NumberMode.BOX,
         native_min_value=0,
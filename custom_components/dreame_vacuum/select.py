@@ -429,7 +429,7 @@ def async_update_segment_selects(
     new_ids = []
     if coordinator.device and coordinator.device.status.map_list:
         for k, v in coordinator.device.status.map_data_list.items():
-            for j, s in v.segments.items():
+            for j, s in (v.segments or {}).items():
                 if j not in new_ids:
                     new_ids.append(j)
 
@@ -483,6 +483,12 @@ class DreameVacuumSelectEntity(DreameVacuumEntity, SelectEntity):
         self._attr_options = description.options(coordinator.device, None)
         self._attr_current_option = self.native_value
 
+    def _subscribed_properties(self, description: DreameVacuumSelectEntityDescription) -> frozenset[int] | None:
+        # Options are generated from the device status
+        if description.options is not None and description.property_keys is None:
+            return None
+        return super()._subscribed_properties(description)
+
     @callback
     def _handle_coordinator_update(self) -> None:
         self._attr_options = self.entity_description.options(self.device, None)
@@ -20,6 +20,9 @@ from .const import DOMAIN, UNIT_MINUTES, UNIT_HOURS, UNIT_PERCENT, UNIT_AREA, UN
 from .dreame import (
     DreameVacuumProperty,
     DreameVacuumRelocationStatus,
+    CHARGING_PROPERTIES,
+    FAST_MAPPING_PROPERTIES,
+    STATE_PROPERTIES,
 )
 
 from .coordinator import DreameVacuumDataUpdateCoordinator
@@ -34,11 +37,13 @@ class DreameVacuumSensorEntityDescription(DreameVacuumEntityDescription, SensorE
 SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.CLEANING_TIME,
+        property_keys=FAST_MAPPING_PROPERTIES,
         icon="mdi:timer-sand",
         native_unit_of_measurement=UNIT_MINUTES,
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.CLEANING_TIME,
+        property_keys=FAST_MAPPING_PROPERTIES,
         name="Mapping Time",
         key="mapping_time",
         icon="mdi:map-clock",
@@ -48,21 +53,25 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.CLEANED_AREA,
+        property_keys=FAST_MAPPING_PROPERTIES,
         icon="mdi:ruler-square",
         native_unit_of_measurement=UNIT_AREA,
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.STATE,
+        property_keys=STATE_PROPERTIES,
         device_class=f"{DOMAIN}__state",
         icon="mdi:robot-vacuum",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.STATUS,
+        property_keys=[],
         device_class=f"{DOMAIN}__status",
         icon="mdi:vacuum",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.RELOCATION_STATUS,
+        property_keys=FAST_MAPPING_PROPERTIES,
         device_class=f"{DOMAIN}__relocation_status",
         icon_fn=lambda value, device: (
             "mdi:map-marker-distance"
@@ -80,11 +89,13 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.TASK_STATUS,
+        property_keys=[],
         device_class=f"{DOMAIN}__task_status",
         icon="mdi:file-tree",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.WATER_TANK,
+        property_keys=[],
         device_class=f"{DOMAIN}__water_tank_and_mop",
         icon_fn=lambda value, device: (
             "mdi:water-pump-off" if not device.status.water_tank_or_mop_installed else "mdi:water-pump"
@@ -94,6 +105,7 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         key="mop_pad",
+        property_keys=[DreameVacuumProperty.WATER_TANK],
         device_class=f"{DOMAIN}__water_tank_and_mop",
         icon="mdi:google-circles-communities",
         value_fn=lambda value, device: device.status.water_tank_name,
@@ -101,11 +113,13 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.DUST_COLLECTION,
+        property_keys=[],
         device_class=f"{DOMAIN}__dust_collection",
         icon_fn=lambda value, device: "mdi:delete-off" if not device.status.dust_collection else "mdi:delete-sweep",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.AUTO_EMPTY_STATUS,
+        property_keys=[],
         device_class=f"{DOMAIN}__auto_empty_status",
         icon_fn=lambda value, device: (
             "mdi:delete-clock"
@@ -115,11 +129,13 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.SELF_WASH_BASE_STATUS,
+        property_keys=[],
         device_class=f"{DOMAIN}__self_wash_base_status",
         icon="mdi:dishwasher",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.ERROR,
+        property_keys=[],
         device_class=f"{DOMAIN}__error",
         icon_fn=lambda value, device: (
             "mdi:alert-circle-outline"
@@ -129,11 +145,13 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.CHARGING_STATUS,
+        property_keys=CHARGING_PROPERTIES,
         device_class=f"{DOMAIN}__charging_status",
         icon="mdi:home-lightning-bolt",
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.BATTERY_LEVEL,
+        property_keys=CHARGING_PROPERTIES,
         device_class=SensorDeviceClass.BATTERY,
         native_unit_of_measurement=UNIT_PERCENT,
         icon_fn=lambda value, device: icon_for_battery_level(device.status.battery_level, device.status.charging),
@@ -260,6 +278,7 @@ SENSORS: tuple[DreameVacuumSensorEntityDescription, ...] = (
     ),
     DreameVacuumSensorEntityDescription(
         property_key=DreameVacuumProperty.FIRST_CLEANING_DATE,
+        property_keys=[],
         icon="mdi:calendar-start",
         device_class=SensorDeviceClass.TIMESTAMP,
         entity_category=EntityCategory.DIAGNOSTIC,
@@ -336,9 +355,10 @@ class DreameVacuumSensorEntity(DreameVacuumEntity, SensorEntity):
         description: DreameVacuumSensorEntityDescription,
     ) -> None:
         """Initialize a Dreame Vacuum sensor entity."""
-        super().__init__(coordinator, description)
-
+        # Value function must be set before the entity subscribes to its properties
         if description.property_key is not None and description.value_fn is None:
             prop = f"{description.property_key.name.lower()}_name"
             if hasattr(coordinator.device.status, prop):
                 description.value_fn = lambda value, device: getattr(device.status, prop)
+
+        super().__init__(coordinator, description)
@@ -39,11 +39,13 @@ SWITCHES: tuple[DreameVacuumSwitchEntityDescription, ...] = (
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.CARPET_BOOST,
+        property_keys=[DreameVacuumProperty.CARPET_RECOGNITION],
         icon_fn=lambda value, device: "mdi:upload-off" if value == 0 else "mdi:upload",
         entity_category=EntityCategory.CONFIG,
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.OBSTACLE_AVOIDANCE,
+        property_keys=[],
         icon_fn=lambda value, device: "mdi:video-3d-off" if value == 0 else "mdi:video-3d",
         entity_category=EntityCategory.CONFIG,
     ),
@@ -53,16 +55,19 @@ SWITCHES: tuple[DreameVacuumSwitchEntityDescription, ...] = (
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.CHILD_LOCK,
+        property_keys=[],
         icon_fn=lambda value, device: "mdi:lock-off" if value == 0 else "mdi:lock",
         entity_category=EntityCategory.CONFIG,
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.TIGHT_MOPPING,
+        property_keys=[DreameVacuumProperty.WATER_TANK],
         icon="mdi:heating-coil",
         entity_category=EntityCategory.CONFIG,
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.DND,
+        property_keys=[],
         name="DND",
         icon_fn=lambda value, device: "mdi:minus-circle-off-outline" if not value else "mdi:minus-circle-outline",
         format_fn=lambda value, device: bool(value),
@@ -80,6 +85,7 @@ SWITCHES: tuple[DreameVacuumSwitchEntityDescription, ...] = (
     ),
     DreameVacuumSwitchEntityDescription(
         property_key=DreameVacuumProperty.AUTO_DUST_COLLECTING,
+        property_keys=[],
         icon_fn=lambda value, device: "mdi:autorenew-off" if value == 0 else "mdi:autorenew",
         entity_category=EntityCategory.CONFIG,
     ),